@@ -13,11 +13,15 @@ _PROJECT_ROOT = _APP_DIR.parent
 sys.path.insert(0, str(_PROJECT_ROOT / "src"))
 
 from trillium_watts.config import load_config
-from trillium_watts.simulation.solar import calculate_solar_energy
-from trillium_watts.simulation.scenarios import simulate_all_scenarios
+from trillium_watts.models.registry import ModelRegistry
+from trillium_watts.prediction.export import combine_predictions
+from trillium_watts.serving.service import ForecastService
+from trillium_watts.simulation.dashboard import SENSITIVITY_AXES, compute_scenario_results, compute_sensitivity_grid
+from trillium_watts.simulation.memo import SimulationCache
 from trillium_watts.visualization.plots_plotly import (
     create_demand_time_series_figure,
     create_scenario_comparison_figure,
+    create_sensitivity_heatmap,
 )
 
 # --- Load config ---
@@ -25,7 +29,8 @@ config = load_config()
 
 # --- Load predictions data ---
 @st.cache_data
-def load_predictions(path: str) -> pd.DataFrame:
+def load_predictions(path: str, mtime: float) -> pd.DataFrame:
+    # mtime is part of the cache key so a rewritten file is read again
     df = pd.read_csv(path, parse_dates=["Fecha"])
     df = df.sort_values("Fecha")
     # Standardize Tipo labels
@@ -45,8 +50,65 @@ def load_predictions(path: str) -> pd.DataFrame:
     return df
 
 
+@st.cache_resource
+def get_simulation_cache() -> SimulationCache:
+    """Simulation results shared by all sessions of this server."""
+    return SimulationCache()
+
+
+@st.cache_resource
+def get_forecast_service() -> ForecastService:
+    """Warm model shared by all sessions; picks up newly promoted versions."""
+    return ForecastService.from_config(config, _PROJECT_ROOT, max_wait_ms=1.0)
+
+
+@st.cache_data
+def load_history(path: str, mtime: float) -> pd.DataFrame:
+    return pd.read_csv(path, index_col=0, parse_dates=True)
+
+
+@st.cache_resource(max_entries=64)
+def demand_figure(_df: pd.DataFrame, source: str, color_historical: str, color_predicted: str, x_range: tuple, max_points: int, method: str):
+    return create_demand_time_series_figure(
+        _df,
+        color_historical=color_historical,
+        color_predicted=color_predicted,
+        max_points=max_points,
+        x_range=x_range,
+        method=method,
+    )
+
+
 predictions_path = _PROJECT_ROOT / config.data.predictions_path
-df = load_predictions(str(predictions_path))
+processed_path = _PROJECT_ROOT / config.data.processed_data_path
+sim_cache = get_simulation_cache()
+
+# --- Sidebar: forecast source ---
+st.sidebar.header("Pronostico")
+live_available = (
+    processed_path.exists()
+    and ModelRegistry(_PROJECT_ROOT / config.model.model_save_path).current_version() is not None
+)
+en_vivo = live_available and st.sidebar.toggle(
+    "Pronostico en vivo",
+    help="Pronostica desde los datos procesados mas recientes con el modelo actual.",
+)
+
+if en_vivo:
+    service = get_forecast_service()
+    service.update_history(load_history(str(processed_path), processed_path.stat().st_mtime))
+    model_version, forecast = service.forecast(service.max_horizon)
+    df = combine_predictions(service.history, forecast, config.features.target)
+    source = f"live:{model_version}:{service.as_of.isoformat()}"
+    watermark = f"Pronostico en vivo del modelo {model_version}, datos hasta {service.as_of:%Y-%m-%d}"
+else:
+    predictions_mtime = predictions_path.stat().st_mtime
+    df = load_predictions(str(predictions_path), predictions_mtime)
+    source = f"csv:{predictions_path}:{predictions_mtime}"
+    as_of = df.loc[df["Tipo"] == "Historica", "Fecha"].max()
+    watermark = f"Pronostico del archivo {predictions_path.name}, " + (
+        f"datos hasta {as_of:%Y-%m-%d}" if pd.notna(as_of) else "sin datos historicos"
+    )
 
 # --- Sidebar: simulation parameters ---
 st.sidebar.header("Parametros de Simulacion")
@@ -86,15 +148,29 @@ df_sim = df_predicha.head(dias)
 
 # --- Title ---
 st.title("Simulacion de Energia Solar - Leticia, Colombia")
+st.caption(watermark)
 
 # --- Demand time series chart ---
 st.subheader("Demanda Energetica (Historica + Predicha)")
 
 viz = config.visualization
-fig_ts = create_demand_time_series_figure(
+fecha_min, fecha_max = df["Fecha"].min().date(), df["Fecha"].max().date()
+# Full resolution is only drawn once the visible range holds <= max_points days
+rango_visible = st.slider(
+    "Rango visible",
+    min_value=fecha_min,
+    max_value=fecha_max,
+    value=(fecha_min, fecha_max),
+    format="YYYY-MM-DD",
+)
+fig_ts = demand_figure(
     df,
-    color_historical=viz.colors["historical"],
-    color_predicted=viz.colors["predicted"],
+    source,
+    viz.colors["historical"],
+    viz.colors["predicted"],
+    rango_visible,
+    viz.max_points,
+    viz.downsampling,
 )
 st.plotly_chart(fig_ts, use_container_width=True)
 
@@ -111,49 +187,80 @@ active_scenarios = {
 if not active_scenarios:
     st.warning("Selecciona al menos un escenario solar.")
 else:
-    demand_array = df_sim["ACTIVA"].values
-
-    # Metrics per scenario
-    for name, capacity_kw in active_scenarios.items():
-        daily_solar = calculate_solar_energy(capacity_kw, H, PR)
-        energy_total = daily_solar * dias
-        diesel_saved = energy_total / kwh_por_litro
-        co2_avoided = diesel_saved * co2_por_litro
-        savings = diesel_saved * cop_diesel
-
-        with st.expander(f"Resultados para {name}"):
-            st.metric(f"{name} - Energia Generada Total", f"{energy_total:,.0f} kWh")
-            st.metric(f"{name} - Diesel Ahorrado", f"{diesel_saved:,.0f} L")
-            st.metric(f"{name} - CO2 Evitado", f"{co2_avoided:,.0f} kg")
-            st.metric(f"{name} - Ahorro Economico", f"${savings:,.0f} COP")
-
-    # Summary table
-    df_summary = simulate_all_scenarios(
+    sim_params = dict(
         scenarios=active_scenarios,
-        demand_array=demand_array,
-        num_days=dias,
+        demand_array=df_sim["ACTIVA"].values,
         h_radiation=H,
         performance_ratio=PR,
         kwh_per_liter=kwh_por_litro,
         co2_per_liter=co2_por_litro,
         diesel_price_cop=cop_diesel,
     )
+    # One vectorized evaluation feeds the metrics, the chart and the table
+    results = compute_scenario_results(**sim_params, cache=sim_cache)
+
+    # Metrics per scenario
+    for name in active_scenarios:
+        metrics = results.metrics(name)
+        with st.expander(f"Resultados para {name}"):
+            st.metric(f"{name} - Energia Generada Total", f"{metrics['Generacion Solar Total (kWh)']:,.0f} kWh")
+            st.metric(f"{name} - Diesel Ahorrado", f"{metrics['Litros Diesel Ahorrados']:,.0f} L")
+            st.metric(f"{name} - CO2 Evitado", f"{metrics['Reduccion CO2 (kg)']:,.0f} kg")
+            st.metric(f"{name} - Ahorro Economico", f"${metrics['Ahorro Economico (COP)']:,.0f} COP")
 
     # Comparison chart
     st.subheader("Comparativa de Beneficios por Escenario")
-    chart_cols = [
-        "Escenario",
-        "Generacion Solar Total (kWh)",
-        "Litros Diesel Ahorrados",
-        "Reduccion CO2 (kg)",
-        "Ahorro Economico (COP)",
-    ]
-    fig_bar = create_scenario_comparison_figure(df_summary[chart_cols])
+    fig_bar = sim_cache.get_or_compute(
+        "scenario_comparison_figure",
+        lambda: create_scenario_comparison_figure(results.chart_data),
+        **sim_params,
+    )
     st.plotly_chart(fig_bar, use_container_width=True)
 
     # Summary data table
     st.subheader("Tabla Resumen")
-    st.dataframe(df_summary, use_container_width=True)
+    st.dataframe(results.summary, use_container_width=True)
+
+# --- Sensitivity analysis ---
+st.subheader("Analisis de Sensibilidad")
+ejes = st.radio(
+    "Ejes",
+    list(SENSITIVITY_AXES),
+    format_func={"h_pr": "Radiacion H x PR", "capacity_price": "Capacidad x Precio diesel"}.get,
+    horizontal=True,
+)
+escenario_sens = st.selectbox("Escenario de referencia", list(config.solar.scenarios))
+capacidad_ref = config.solar.scenarios[escenario_sens]
+fixed = dict(kwh_per_liter=kwh_por_litro, co2_per_liter=co2_por_litro)
+if ejes == "h_pr":
+    x_values, y_values = np.linspace(1.0, 8.0, 36), np.linspace(0.60, 0.95, 36)
+    fixed.update(capacity_kw=capacidad_ref, diesel_price_cop=cop_diesel)
+    labels, current = ("Radiacion H (kWh/m2)", "Performance Ratio"), (H, PR)
+else:
+    x_values = np.linspace(0.0, 2 * max(config.solar.scenarios.values()), 41)
+    y_values = np.linspace(0.5 * cop_diesel, 1.5 * cop_diesel, 41)
+    fixed.update(h_radiation=H, performance_ratio=PR)
+    labels, current = ("Capacidad (kW)", "Precio diesel (COP/L)"), (capacidad_ref, cop_diesel)
+
+sens_params = dict(demand_array=df_sim["ACTIVA"].values, x_values=x_values, y_values=y_values, axes=ejes, **fixed)
+# One vectorized grid feeds both heatmaps
+grid = compute_sensitivity_grid(**sens_params, cache=sim_cache)
+x_name, y_name = SENSITIVITY_AXES[ejes]
+for column, metric in zip(st.columns(2), ["Ahorro Economico (COP)", "Reduccion CO2 (kg)"]):
+    fig_heat = sim_cache.get_or_compute(
+        "sensitivity_heatmap",
+        lambda metric=metric: create_sensitivity_heatmap(grid, x_name, y_name, metric, *labels, current=current),
+        metric=metric,
+        current=current,
+        **sens_params,
+    )
+    column.plotly_chart(fig_heat, use_container_width=True)
+
+stats = sim_cache.stats()
+st.sidebar.caption(
+    f"Cache de simulacion: {stats['hits']} aciertos, {stats['misses']} fallos, "
+    f"{stats['size']}/{stats['max_entries']} entradas"
+)
 
 # --- Footer ---
 st.caption(
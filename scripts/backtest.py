@@ -0,0 +1,73 @@
+"""Rolling multi-origin backtest of the autoregressive forecaster."""
+
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trillium_watts.config import load_config, get_project_root
+from trillium_watts.models.registry import ModelRegistry
+from trillium_watts.prediction.backtest import backtest
+
+
+def main():
+    config = load_config()
+    root = get_project_root()
+
+    # Load processed data
+    processed_path = root / config.data.processed_data_path
+    print(f"Loading processed data from {processed_path}...")
+    df = pd.read_csv(processed_path, index_col=0, parse_dates=True)
+
+    # Load the current registry version
+    registry = ModelRegistry(root / config.model.model_save_path)
+    print(f"Loading model {registry.current_version()} from {registry.root}...")
+    model, scaler_X, scaler_y = registry.load(runtime="auto")
+
+    # train.py retrains the final model on all data up to "last_date", so only
+    # origins after that date are out-of-sample. Otherwise start at the
+    # train/test split and say that the errors are in-sample.
+    horizon = max(config.prediction.horizons)
+    window_size = config.model.window_size
+    n_sequences = len(df) - window_size
+    split_date = df.index[window_size + int(n_sequences * config.model.train_split_ratio)]
+    last_date = registry.metadata().get("last_date")
+    trained_through = pd.Timestamp(last_date) if last_date else None
+    if trained_through is not None and trained_through < df.index[-horizon - 1]:
+        origin_start, in_sample = trained_through, False
+        print(f"Model trained through {trained_through.date()}: origins after it are out-of-sample.")
+    else:
+        origin_start, in_sample = split_date, True
+        print(
+            f"WARNING: the model was trained on all data (through {last_date or 'the end of the history'}); "
+            f"origins from the train/test split ({split_date.date()}) are in-sample and the errors are optimistic."
+        )
+
+    print(f"Backtesting {horizon}-day forecasts from every origin since {origin_start.date()}...")
+    start = time.perf_counter()
+    result = backtest(
+        model, df,
+        features=config.features.feature_columns,
+        target=config.features.target,
+        window_size=window_size,
+        scaler_X=scaler_X,
+        scaler_y=scaler_y,
+        horizon=horizon,
+        start=origin_start,
+        forecast_mode=registry.metadata().get("forecast_mode", "autoregressive"),
+    )
+    print(f"  {len(result.origin_dates)} origins in {time.perf_counter() - start:.2f}s")
+
+    metrics = result.metrics()
+    print(f"\nError by horizon (days), {'in-sample' if in_sample else 'out-of-sample'}:")
+    print(metrics.loc[config.prediction.horizons].to_string(float_format="{:,.2f}".format))
+
+    output_path = result.save(root / config.data.backtest_path)
+    print(f"\nBacktest saved to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Benchmark every configured architecture: validation MAE vs epoch and inference time."""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trillium_watts.config import load_config, get_project_root
+from trillium_watts.models.sequences import create_sequences, split_data, fit_scalers, apply_scalers
+from trillium_watts.models.training import benchmark_architectures
+
+
+def main():
+    config = load_config()
+    root = get_project_root()
+
+    # Load processed data
+    processed_path = root / config.data.processed_data_path
+    print(f"Loading processed data from {processed_path}...")
+    df = pd.read_csv(processed_path, index_col=0, parse_dates=True)
+
+    features = config.features.feature_columns
+    target = config.features.target
+    data = df[features].values
+    target_index = features.index(target)
+
+    # Create, split and scale sequences exactly as in train.py
+    X_raw, y_raw = create_sequences(data, config.model.window_size, target_index)
+    X_train_raw, X_test_raw, y_train_raw, y_test_raw = split_data(X_raw, y_raw, config.model.train_split_ratio)
+    scaler_X, scaler_y = fit_scalers(X_train_raw, y_train_raw)
+    X_train, y_train = apply_scalers(X_train_raw, y_train_raw, scaler_X, scaler_y)
+    X_test, y_test = apply_scalers(X_test_raw, y_test_raw, scaler_X, scaler_y)
+
+    print(f"\nBenchmarking {', '.join(a.upper() for a in config.model.architectures)}...")
+    rows = benchmark_architectures(
+        config.model.architectures,
+        config.model.param_grid,
+        X_train, y_train,
+        X_test, y_test,
+        early_stopping_patience=config.model.early_stopping.patience,
+    )
+
+    summary = pd.DataFrame(rows).set_index("model_type")
+    print("\nArchitecture benchmark:")
+    print(summary[["val_mae", "epochs_ran", "epoch_time", "predict_time"]].to_string(float_format="{:.4f}".format))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Size the solar plant and project its finances under the investment config."""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trillium_watts.config import load_config, get_project_root
+from trillium_watts.simulation.projection import project_finances
+from trillium_watts.simulation.sizing import optimize_capacity
+
+
+def main():
+    config = load_config()
+    root = get_project_root()
+    investment, storage = config.investment, config.storage
+
+    # The last year of history is the representative demand and irradiance
+    processed_path = root / config.data.processed_data_path
+    print(f"Loading processed data from {processed_path}...")
+    df = pd.read_csv(processed_path, index_col=0, parse_dates=True).iloc[-365:]
+    demand = df[config.features.target].to_numpy()
+    h_radiation = df["ALLSKY_SFC_SW_DWN"].to_numpy()
+    print(f"Representative year: {df.index[0].date()} to {df.index[-1].date()}")
+
+    best = {}
+    for objective in ("npv", "lcoe"):
+        result = best[objective] = optimize_capacity(
+            demand, h_radiation,
+            performance_ratio=config.solar.default_performance_ratio,
+            kwh_per_liter=config.economic.kwh_per_liter_diesel,
+            diesel_price_cop=config.economic.diesel_price_cop,
+            capex_cop_per_kw=investment.capex_cop_per_kw,
+            objective=objective,
+            max_capacity_kw=investment.max_capacity_kw,
+            max_battery_kwh=investment.max_battery_kwh,
+            battery_capex_cop_per_kwh=investment.battery_capex_cop_per_kwh,
+            om_fraction=investment.om_fraction,
+            discount_rate=investment.discount_rate,
+            lifetime_years=investment.lifetime_years,
+            battery_power_kw=storage.battery_power_kw,
+            round_trip_efficiency=storage.round_trip_efficiency,
+        )
+        print(f"\nBest size by {objective.upper()}:")
+        print(f"  Capacity:      {result.capacity_kw:,.0f} kW")
+        print(f"  Battery:       {result.battery_kwh:,.0f} kWh")
+        print(f"  NPV:           {result.npv_cop:,.0f} COP")
+        print(f"  LCOE:          {result.lcoe_cop_per_kwh:,.0f} COP/kWh")
+        print(f"  Diesel saved:  {result.annual_diesel_liters:,.0f} L/year")
+
+    # Lifetime cash flows of the configured scenarios and the NPV-optimal size
+    scenarios = dict(config.solar.scenarios, **{"Optimo (VPN)": best["npv"].capacity_kw})
+    projection = project_finances(
+        scenarios, demand, h_radiation,
+        performance_ratio=config.solar.default_performance_ratio,
+        kwh_per_liter=config.economic.kwh_per_liter_diesel,
+        diesel_price_cop=config.economic.diesel_price_cop,
+        capex_cop_per_kw=investment.capex_cop_per_kw,
+        om_fraction=investment.om_fraction,
+        discount_rate=investment.discount_rate,
+        lifetime_years=investment.lifetime_years,
+        degradation=investment.degradation,
+        diesel_escalation=investment.diesel_escalation,
+        om_escalation=investment.om_escalation,
+        demand_growth=investment.demand_growth,
+    )
+    print(f"\nProjection over {investment.lifetime_years} years (PV only):")
+    print(projection.summary().to_string(index=False, float_format="{:,.2f}".format))
+
+
+if __name__ == "__main__":
+    main()
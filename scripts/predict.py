@@ -1,17 +1,22 @@
-"""Run autoregressive prediction and export CSV for the Streamlit app."""
+"""Run prediction, append it to the forecast store and refresh the app's CSV."""
 
 import sys
 from pathlib import Path
 
 import pandas as pd
-from sklearn.preprocessing import MinMaxScaler
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
 
 from trillium_watts.config import load_config, get_project_root
 from trillium_watts.models.persistence import load_model
-from trillium_watts.prediction.autoregressive import predict_future, prepare_initial_sequence
-from trillium_watts.prediction.export import export_predictions_csv
+from trillium_watts.models.registry import ModelRegistry
+from trillium_watts.prediction.autoregressive import (
+    predict_future,
+    predict_future_quantiles,
+    prepare_initial_sequence,
+)
+from trillium_watts.prediction.direct import predict_direct
+from trillium_watts.prediction.store import ForecastStore
 
 
 def main():
@@ -28,41 +33,71 @@ def main():
     window_size = config.model.window_size
     num_steps = config.prediction.default_horizon
 
-    # Load trained model
+    # Load the current registry version (or a legacy flat save)
     model_dir = root / config.model.model_save_path
-    print(f"Loading model from {model_dir}...")
-    model, scaler_X, scaler_y = load_model(model_dir)
+    registry = ModelRegistry(model_dir)
+    forecast_mode = "autoregressive"
+    model_version = "unversioned"
+    if registry.exists():
+        model_version = registry.current_version()
+        print(f"Loading model {model_version} from {registry.root}...")
+        model, scaler_X, scaler_y = registry.load(runtime="auto")
+        forecast_mode = registry.metadata().get("forecast_mode", forecast_mode)
+    else:
+        print(f"Loading model from {model_dir}...")
+        model, scaler_X, scaler_y = load_model(model_dir)
 
-    # Fit a full-data scaler for the autoregressive prediction
-    scaler_full = MinMaxScaler()
-    scaler_full.fit(df[features].values)
-
-    # Prepare initial sequence
-    initial_seq = prepare_initial_sequence(df, features, window_size, scaler_full)
+    # Prepare initial sequence with the persisted training scaler
+    initial_seq = prepare_initial_sequence(df, features, window_size, scaler_X)
 
     # Predict
-    print(f"Predicting {num_steps} days into the future...")
-    predictions = predict_future(
-        model=model,
-        initial_sequence_scaled=initial_seq,
-        num_steps=num_steps,
-        scaler_X=scaler_full,
-        features_df=df,
-        target_name=target,
-        features_list=features,
-    )
+    print(f"Predicting {num_steps} days into the future ({forecast_mode})...")
+    bands = None
+    if forecast_mode == "direct":
+        predictions = predict_direct(model, initial_seq, num_steps, scaler_y, df)
+    else:
+        predictions = predict_future(
+            model=model,
+            initial_sequence_scaled=initial_seq,
+            num_steps=num_steps,
+            scaler_X=scaler_X,
+            features_df=df,
+            target_name=target,
+            features_list=features,
+            scaler_y=scaler_y,
+        )
+
+        # Probabilistic bands from Monte Carlo dropout sample paths
+        n_samples = config.prediction.n_samples
+        print(f"Sampling {n_samples} dropout paths for quantile bands...")
+        bands = predict_future_quantiles(
+            model=model,
+            initial_sequence_scaled=initial_seq,
+            num_steps=num_steps,
+            scaler_X=scaler_X,
+            features_df=df,
+            target_name=target,
+            features_list=features,
+            scaler_y=scaler_y,
+            n_samples=n_samples,
+            quantiles=tuple(config.prediction.quantiles),
+        )
     print(f"Predictions:\n{predictions}")
 
-    # Export
+    # Export: append the run to the store, then refresh the CSV view
+    store = ForecastStore(root / config.data.forecast_store_path, target_column=target)
+    n_new = store.append_actuals(df[target])
+    run_path = store.append_forecast(predictions, model_version, bands=bands, as_of=df.index[-1])
+    print(f"\nStored {n_new} new actuals and forecast run {run_path.relative_to(store.root)}")
+
     output_path = root / config.data.predictions_path
     viz_config = config.visualization
-    export_predictions_csv(
-        df, predictions, output_path,
-        target_column=target,
+    store.write_csv_view(
+        output_path,
         label_historical=viz_config.tipo_labels["historical"],
         label_predicted=viz_config.tipo_labels["predicted"],
     )
-    print(f"\nPredictions exported to {output_path}")
+    print(f"Predictions exported to {output_path}")
 
 
 if __name__ == "__main__":
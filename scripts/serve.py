@@ -0,0 +1,37 @@
+"""Serve forecasts and simulations on localhost from a warm, in-memory model."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trillium_watts.config import load_config, get_project_root
+from trillium_watts.serving.server import create_server
+from trillium_watts.serving.service import ForecastService
+
+
+def main():
+    config = load_config()
+    root = get_project_root()
+    serving = config.serving
+
+    print("Loading model and processed history...")
+    service = ForecastService.from_config(
+        config, root,
+        max_batch=serving.max_batch,
+        max_wait_ms=serving.max_wait_ms,
+        cache_entries=serving.cache_entries,
+    )
+    version, _ = service.forecast()  # warm up the model and the cache
+    print(f"Model {version}, data as of {service.as_of.date()}")
+
+    server = create_server(service, serving.host, serving.port)
+    print(f"Serving on http://{serving.host}:{serving.port} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 """Train models via grid search, select best, retrain on all data, save."""
 
 import sys
+import time
 from pathlib import Path
 
 import numpy as np
@@ -10,8 +11,14 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
 
 from trillium_watts.config import load_config, get_project_root
 from trillium_watts.models.sequences import create_sequences, split_data, fit_scalers, apply_scalers
-from trillium_watts.models.training import grid_search, select_best_params, retrain_final_model, evaluate_model
-from trillium_watts.models.persistence import save_model
+from trillium_watts.models.training import (
+    grid_search,
+    select_best_params,
+    retrain_final_model,
+    retrain_final_ensemble,
+    evaluate_model,
+)
+from trillium_watts.models.registry import ModelRegistry, hash_array, hash_config
 
 
 def main():
@@ -28,10 +35,12 @@ def main():
     data = df[features].values
     target_index = features.index(target)
 
-    # Create sequences
+    # Create sequences (multi-step targets for the direct forecast mode)
     window_size = config.model.window_size
-    X_raw, y_raw = create_sequences(data, window_size, target_index)
-    print(f"Created {len(X_raw)} sequences with window_size={window_size}")
+    forecast_mode = config.model.forecast_mode
+    output_steps = max(config.prediction.horizons) if forecast_mode == "direct" else 1
+    X_raw, y_raw = create_sequences(data, window_size, target_index, horizon=output_steps)
+    print(f"Created {len(X_raw)} sequences with window_size={window_size}, output_steps={output_steps}")
 
     # Split
     X_train_raw, X_test_raw, y_train_raw, y_test_raw = split_data(X_raw, y_raw, config.model.train_split_ratio)
@@ -57,12 +66,23 @@ def main():
     print(f"Best val_mae: {best['val_mae']:.4f}")
 
     # Retrain on all data
-    print("\nRetraining on all data...")
     X_all, y_all = apply_scalers(X_raw, y_raw, scaler_X, scaler_y)
-    model = retrain_final_model(
-        model_type, best, X_all, y_all,
-        early_stopping_patience=config.model.early_stopping.patience,
-    )
+    start = time.perf_counter()
+    n_members = config.model.ensemble_members
+    if n_members > 1:
+        print(f"\nRetraining a {n_members}-member ensemble on all data...")
+        model = retrain_final_ensemble(
+            model_type, best, X_all, y_all, n_members,
+            early_stopping_patience=config.model.early_stopping.patience,
+        )
+    else:
+        print("\nRetraining on all data...")
+        model = retrain_final_model(
+            model_type, best, X_all, y_all,
+            early_stopping_patience=config.model.early_stopping.patience,
+        )
+
+    training_time = time.perf_counter() - start
 
     # Evaluate on test set
     metrics = evaluate_model(model, X_test, y_test, scaler_y)
@@ -71,10 +91,27 @@ def main():
     print(f"  RMSE: {metrics['rmse']:.2f}")
     print(f"  R2:   {metrics['r2']:.4f}")
 
-    # Save
-    save_dir = root / config.model.model_save_path
-    save_model(model, scaler_X, scaler_y, save_dir)
-    print(f"\nModel saved to {save_dir}")
+    # Register and promote a new version
+    registry = ModelRegistry(root / config.model.model_save_path)
+    version = registry.register(
+        model, scaler_X, scaler_y,
+        metadata={
+            "model_type": model_type,
+            "ensemble_members": n_members,
+            "params": best["params"],
+            "config_hash": hash_config(config),
+            "data_hash": hash_array(data),
+            "features": features,
+            "target": target,
+            "window_size": window_size,
+            "forecast_mode": forecast_mode,
+            "output_steps": output_steps,
+            "last_date": str(df.index[-1].date()),
+            "metrics": {k: float(metrics[k]) for k in ("mae", "rmse", "r2")},
+            "training_time_s": training_time,
+        },
+    )
+    print(f"\nModel registered as {version} in {registry.root}")
 
 
 if __name__ == "__main__":
@@ -22,6 +22,8 @@ class DataConfig:
     date_column: str
     date_cutoff: str
     missing_periods: list[list[str]]
+    backtest_path: str = "data/predictions/backtest.npz"
+    forecast_store_path: str = "data/predictions/store"
 
 
 @dataclass
@@ -44,12 +46,33 @@ class ModelConfig:
     model_save_path: str
     param_grid: dict
     early_stopping: EarlyStoppingConfig
+    architectures: list[str] = field(default_factory=lambda: ["gru", "lstm"])
+    ensemble_members: int = 1
+    forecast_mode: str = "autoregressive"
+
+    def __post_init__(self):
+        # Checked here so a bad combination fails before the grid search runs
+        if self.forecast_mode not in ("autoregressive", "direct"):
+            raise ValueError(f"Unknown forecast_mode '{self.forecast_mode}'. Available: autoregressive, direct")
+        if self.forecast_mode == "direct" and self.ensemble_members > 1:
+            raise ValueError("Ensembles support single-step targets only; use ensemble_members: 1 with forecast_mode: direct.")
 
 
 @dataclass
 class PredictionConfig:
     horizons: list[int]
     default_horizon: int
+    n_samples: int = 200
+    quantiles: list[float] = field(default_factory=lambda: [0.1, 0.5, 0.9])
+
+
+@dataclass
+class ServingConfig:
+    host: str = "127.0.0.1"
+    port: int = 8765
+    max_batch: int = 64
+    max_wait_ms: float = 5.0
+    cache_entries: int = 32
 
 
 @dataclass
@@ -59,6 +82,39 @@ class SolarConfig:
     scenarios: dict[str, int]
 
 
+@dataclass
+class StorageConfig:
+    battery_kwh: float = 0.0
+    battery_power_kw: float | None = None
+    round_trip_efficiency: float = 0.9
+
+
+@dataclass
+class InvestmentConfig:
+    capex_cop_per_kw: float = 4_000_000.0
+    battery_capex_cop_per_kwh: float = 1_600_000.0
+    om_fraction: float = 0.015
+    discount_rate: float = 0.10
+    lifetime_years: int = 25
+    degradation: float = 0.005
+    diesel_escalation: float = 0.03
+    om_escalation: float = 0.0
+    demand_growth: float = 0.0
+    max_capacity_kw: float = 10_000.0
+    max_battery_kwh: float = 0.0
+
+
+@dataclass
+class UncertaintyConfig:
+    n_samples: int = 200_000
+    chunk_size: int = 50_000
+    h_radiation_sd: float = 0.6
+    performance_ratio_sd: float = 0.05
+    diesel_price_cv: float = 0.15
+    demand_cv: float = 0.08
+    quantiles: list[float] = field(default_factory=lambda: [0.05, 0.5, 0.95])
+
+
 @dataclass
 class EconomicConfig:
     kwh_per_liter_diesel: float
@@ -70,6 +126,8 @@ class EconomicConfig:
 class VisualizationConfig:
     tipo_labels: dict[str, str]
     colors: dict[str, str]
+    max_points: int = 2000
+    downsampling: str = "lttb"
 
 
 @dataclass
@@ -81,6 +139,10 @@ class Config:
     solar: SolarConfig
     economic: EconomicConfig
     visualization: VisualizationConfig
+    serving: ServingConfig = field(default_factory=ServingConfig)
+    storage: StorageConfig = field(default_factory=StorageConfig)
+    uncertainty: UncertaintyConfig = field(default_factory=UncertaintyConfig)
+    investment: InvestmentConfig = field(default_factory=InvestmentConfig)
 
 
 def load_config(path: str | Path | None = None) -> Config:
@@ -100,6 +162,10 @@ def load_config(path: str | Path | None = None) -> Config:
         solar=SolarConfig(**raw["solar"]),
         economic=EconomicConfig(**raw["economic"]),
         visualization=VisualizationConfig(**raw["visualization"]),
+        serving=ServingConfig(**raw.get("serving", {})),
+        storage=StorageConfig(**raw.get("storage", {})),
+        uncertainty=UncertaintyConfig(**raw.get("uncertainty", {})),
+        investment=InvestmentConfig(**raw.get("investment", {})),
     )
 
 
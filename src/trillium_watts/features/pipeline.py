@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
 from trillium_watts.features.cyclic import encode_cyclic_features
@@ -13,3 +14,29 @@ def build_feature_pipeline(df: pd.DataFrame) -> pd.DataFrame:
     df = extract_temporal_features(df)
     df = encode_cyclic_features(df)
     return df
+
+
+def build_calendar_features(dates: pd.DatetimeIndex) -> dict[str, np.ndarray]:
+    """Temporal + cyclic feature arrays for a set of (e.g. future) dates.
+
+    Vectorized counterpart of ``compute_cyclic_for_date`` used when building
+    feature rows for many forecast dates at once. Uses the same encodings as
+    ``build_feature_pipeline`` without materialising a DataFrame.
+    """
+    dates = pd.DatetimeIndex(dates)
+    temporal = {
+        "year": dates.year.to_numpy(),
+        "month": dates.month.to_numpy(),
+        "day": dates.day.to_numpy(),
+        "weekday": dates.weekday.to_numpy(),
+        "weekofyear": dates.isocalendar().week.to_numpy(dtype=int),
+        "quarter": dates.quarter.to_numpy(),
+        "dayofyear": dates.dayofyear.to_numpy(),
+    }
+    periods = {"month": 12, "dayofyear": 365, "weekday": 7, "weekofyear": 52}
+    cyclic = {}
+    for name, period in periods.items():
+        angle = 2 * np.pi * temporal[name] / period
+        cyclic[f"{name}_sin"] = np.sin(angle)
+        cyclic[f"{name}_cos"] = np.cos(angle)
+    return {**temporal, **cyclic}
@@ -1,30 +1,48 @@
-"""Neural network architectures — LSTM and GRU model builders."""
+"""Neural network architectures — LSTM, GRU, TCN and attention model builders."""
 
 from __future__ import annotations
 
-from tensorflow.keras.layers import LSTM, GRU, Dense, Dropout
-from tensorflow.keras.models import Sequential
+from tensorflow.keras.layers import (
+    LSTM,
+    GRU,
+    Add,
+    Concatenate,
+    Conv1D,
+    Cropping1D,
+    Dense,
+    Dropout,
+    Flatten,
+    Input,
+    LayerNormalization,
+    MultiHeadAttention,
+)
+from tensorflow.keras.models import Model, Sequential
 from tensorflow.keras.optimizers import Adam
 
 
+def _compile(model: Model, learning_rate: float) -> Model:
+    model.compile(
+        optimizer=Adam(learning_rate=learning_rate),
+        loss="mse",
+        metrics=["mae"],
+    )
+    return model
+
+
 def build_lstm_model(
     units: int,
     dropout: float,
     learning_rate: float,
     input_shape: tuple[int, int],
+    output_steps: int = 1,
 ) -> Sequential:
     """Build and compile an LSTM model."""
     model = Sequential([
         LSTM(units, input_shape=input_shape),
         Dropout(dropout),
-        Dense(1, activation="linear"),
+        Dense(output_steps, activation="linear"),
     ])
-    model.compile(
-        optimizer=Adam(learning_rate=learning_rate),
-        loss="mse",
-        metrics=["mae"],
-    )
-    return model
+    return _compile(model, learning_rate)
 
 
 def build_gru_model(
@@ -32,19 +50,83 @@ def build_gru_model(
     dropout: float,
     learning_rate: float,
     input_shape: tuple[int, int],
+    output_steps: int = 1,
 ) -> Sequential:
     """Build and compile a GRU model."""
     model = Sequential([
         GRU(units, input_shape=input_shape),
         Dropout(dropout),
-        Dense(1, activation="linear"),
+        Dense(output_steps, activation="linear"),
     ])
-    model.compile(
-        optimizer=Adam(learning_rate=learning_rate),
-        loss="mse",
-        metrics=["mae"],
-    )
-    return model
+    return _compile(model, learning_rate)
+
+
+def build_tcn_model(
+    units: int,
+    dropout: float,
+    learning_rate: float,
+    input_shape: tuple[int, int],
+    output_steps: int = 1,
+    kernel_size: int = 3,
+) -> Sequential:
+    """Build and compile a temporal convolutional network (TCN).
+
+    Stacks causal ``Conv1D`` layers with dilations 1, 2, 4, ... until the
+    receptive field covers the whole window, so every timestep is processed
+    in parallel. The last timestep's activations feed the same
+    ``Dropout`` + ``Dense`` head as the recurrent models.
+    """
+    window_size = input_shape[0]
+    layers = [Input(shape=input_shape)]
+    dilation, receptive_field = 1, 1
+    while receptive_field < window_size:
+        layers.append(
+            Conv1D(units, kernel_size, padding="causal", dilation_rate=dilation, activation="relu")
+        )
+        receptive_field += (kernel_size - 1) * dilation
+        dilation *= 2
+    layers += [
+        Cropping1D(cropping=(window_size - 1, 0)),
+        Flatten(),
+        Dropout(dropout),
+        Dense(output_steps, activation="linear"),
+    ]
+    return _compile(Sequential(layers), learning_rate)
+
+
+def build_attention_model(
+    units: int,
+    dropout: float,
+    learning_rate: float,
+    input_shape: tuple[int, int],
+    output_steps: int = 1,
+    num_heads: int = 2,
+) -> Model:
+    """Build and compile a single-block self-attention encoder.
+
+    A causal ``Conv1D`` projection injects local ordering, one multi-head
+    self-attention block with a feed-forward sublayer mixes the window, and
+    the last timestep feeds the usual ``Dropout`` + ``Dense`` head.
+    """
+    window_size = input_shape[0]
+    inputs = Input(shape=input_shape)
+    x = Conv1D(units, 3, padding="causal", activation="relu")(inputs)
+    attn = MultiHeadAttention(num_heads=num_heads, key_dim=max(units // num_heads, 1))(x, x)
+    x = LayerNormalization()(Add()([x, attn]))
+    ffn = Dense(units, activation="relu")(x)
+    x = LayerNormalization()(Add()([x, ffn]))
+    x = Flatten()(Cropping1D(cropping=(window_size - 1, 0))(x))
+    x = Dropout(dropout)(x)
+    outputs = Dense(output_steps, activation="linear")(x)
+    return _compile(Model(inputs, outputs), learning_rate)
+
+
+MODEL_BUILDERS = {
+    "lstm": build_lstm_model,
+    "gru": build_gru_model,
+    "tcn": build_tcn_model,
+    "attention": build_attention_model,
+}
 
 
 def build_model(
@@ -53,9 +135,40 @@ def build_model(
     dropout: float,
     learning_rate: float,
     input_shape: tuple[int, int],
-) -> Sequential:
-    """Factory function — dispatches to the LSTM or GRU builder."""
-    builders = {"lstm": build_lstm_model, "gru": build_gru_model}
-    if model_type not in builders:
-        raise ValueError(f"Unknown model_type '{model_type}'. Choose from {list(builders)}")
-    return builders[model_type](units, dropout, learning_rate, input_shape)
+    output_steps: int = 1,
+) -> Model:
+    """Factory function — dispatches to the LSTM, GRU, TCN or attention builder.
+
+    ``output_steps > 1`` gives a direct multi-horizon head that predicts all
+    steps in a single forward pass.
+    """
+    if model_type not in MODEL_BUILDERS:
+        raise ValueError(f"Unknown model_type '{model_type}'. Choose from {list(MODEL_BUILDERS)}")
+    return MODEL_BUILDERS[model_type](units, dropout, learning_rate, input_shape, output_steps)
+
+
+def build_ensemble_model(
+    model_type: str,
+    n_members: int,
+    units: int,
+    dropout: float,
+    learning_rate: float,
+    input_shape: tuple[int, int],
+) -> Model:
+    """Build ``n_members`` independently initialised models as one Keras graph.
+
+    Every member sees the same input window; their ``Dense(1)`` outputs are
+    concatenated into shape ``(batch, n_members)``, so a single ``fit`` or
+    forward pass trains or evaluates all members at once. Train it against
+    targets tiled to ``(n_samples, n_members)``.
+    """
+    if n_members < 1:
+        raise ValueError(f"n_members must be >= 1, got {n_members}")
+    inputs = Input(shape=input_shape)
+    members = [
+        build_model(model_type, units, dropout, learning_rate, input_shape)
+        for _ in range(n_members)
+    ]
+    outputs = [member(inputs) for member in members]
+    outputs = Concatenate()(outputs) if n_members > 1 else outputs[0]
+    return _compile(Model(inputs, outputs, name=f"{model_type}_ensemble"), learning_rate)
@@ -0,0 +1,185 @@
+"""TensorFlow-free inference for trained GRU/LSTM models.
+
+``export_numpy_weights`` walks a trained Keras model (single model or stacked
+ensemble) and writes its recurrent, dropout and dense layers to a compact
+``.npz``. ``NumpyModel`` reloads that file with NumPy only and reproduces
+``model.predict`` for batched inputs, so forecasting jobs and the dashboard
+can skip importing TensorFlow entirely.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+SUPPORTED_LAYERS = ("GRU", "LSTM", "Dropout", "Dense")
+_ACTIVATIONS = {
+    "linear": lambda x: x,
+    "relu": lambda x: np.maximum(x, 0.0),
+    "tanh": np.tanh,
+    "sigmoid": lambda x: 1.0 / (1.0 + np.exp(-x)),
+}
+
+
+def _activation_name(activation) -> str:
+    name = getattr(activation, "__name__", str(activation))
+    if name not in _ACTIVATIONS:
+        raise ValueError(f"Unsupported activation '{name}'")
+    return name
+
+
+def _members(model) -> list:
+    """Return the member sub-models of a stacked ensemble, or ``[model]``."""
+    nested = [layer for layer in model.layers if hasattr(layer, "layers")]
+    return nested or [model]
+
+
+def export_numpy_weights(model, path: str | Path) -> Path:
+    """Export a trained GRU/LSTM model's weights to a ``.npz`` file.
+
+    Raises:
+        ValueError: If the model contains layers other than
+            GRU/LSTM/Dropout/Dense (e.g. TCN or attention models).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    spec, arrays = [], {}
+
+    for m, member in enumerate(_members(model)):
+        layers = []
+        for j, layer in enumerate(member.layers):
+            kind = type(layer).__name__
+            if kind not in SUPPORTED_LAYERS:
+                raise ValueError(f"Layer '{kind}' is not supported by the NumPy runtime.")
+            entry = {"kind": kind}
+            if kind == "Dropout":
+                entry["rate"] = float(layer.rate)
+            elif kind == "Dense":
+                entry["activation"] = _activation_name(layer.activation)
+            else:
+                if layer.return_sequences or layer.go_backwards:
+                    raise ValueError(f"Only last-state, forward {kind} layers are supported.")
+                if kind == "GRU" and not layer.reset_after:
+                    raise ValueError("Only GRU layers with reset_after=True are supported.")
+                entry["activation"] = _activation_name(layer.activation)
+                entry["recurrent_activation"] = _activation_name(layer.recurrent_activation)
+            for k, weight in enumerate(layer.get_weights()):
+                arrays[f"m{m}_l{j}_w{k}"] = np.asarray(weight, dtype=np.float32)
+            entry["n_weights"] = len(layer.get_weights())
+            layers.append(entry)
+        spec.append(layers)
+
+    np.savez_compressed(path, spec=np.array(json.dumps(spec)), **arrays)
+    return path
+
+
+class NumpyModel:
+    """Pure-NumPy forward pass for models exported by ``export_numpy_weights``.
+
+    ``predict`` returns shape ``(batch, n_members)`` — ``(batch, 1)`` for a
+    single model — matching the Keras output.
+    """
+
+    def __init__(self, spec: list[list[dict]], weights: dict[str, np.ndarray]):
+        self.members = []
+        for m, layers in enumerate(spec):
+            member = []
+            for j, entry in enumerate(layers):
+                w = [weights[f"m{m}_l{j}_w{k}"] for k in range(entry["n_weights"])]
+                member.append((entry, w))
+            self.members.append(member)
+
+    @classmethod
+    def load(cls, path: str | Path) -> NumpyModel:
+        with np.load(path, allow_pickle=False) as data:
+            spec = json.loads(str(data["spec"]))
+            weights = {k: data[k] for k in data.files if k != "spec"}
+        return cls(spec, weights)
+
+    @property
+    def n_members(self) -> int:
+        return len(self.members)
+
+    def predict(
+        self,
+        X: np.ndarray,
+        verbose: int = 0,
+        training: bool = False,
+        rng: np.random.Generator | None = None,
+    ) -> np.ndarray:
+        """Run a batched forward pass over ``X`` of shape (batch, window, features).
+
+        ``verbose`` is accepted (and ignored) for drop-in compatibility with
+        ``keras.Model.predict``. With ``training=True`` dropout is applied
+        using ``rng``.
+        """
+        X = np.asarray(X, dtype=np.float32)
+        if training and rng is None:
+            rng = np.random.default_rng()
+        return np.concatenate(
+            [self._forward(member, X, training, rng) for member in self.members],
+            axis=1,
+        )
+
+    __call__ = predict
+
+    def _forward(self, member, X, training, rng) -> np.ndarray:
+        x = X
+        for entry, w in member:
+            kind = entry["kind"]
+            if kind == "GRU":
+                x = _gru(x, *w, entry)
+            elif kind == "LSTM":
+                x = _lstm(x, *w, entry)
+            elif kind == "Dense":
+                x = _ACTIVATIONS[entry["activation"]](x @ w[0] + w[1])
+            elif kind == "Dropout" and training and entry["rate"] > 0:
+                keep = 1.0 - entry["rate"]
+                x = x * (rng.random(x.shape, dtype=np.float32) < keep) / keep
+        return x
+
+
+def member_count(model) -> int:
+    """Number of outputs a one-step model (single or ensemble) produces."""
+    if isinstance(model, NumpyModel):
+        return model.n_members
+    return len(_members(model))
+
+
+def _gru(x, kernel, recurrent_kernel, bias, entry) -> np.ndarray:
+    """Keras GRU (reset_after=True), gate order z, r, h."""
+    act = _ACTIVATIONS[entry["activation"]]
+    rec_act = _ACTIVATIONS[entry["recurrent_activation"]]
+    units = recurrent_kernel.shape[0]
+    input_bias, recurrent_bias = bias
+    x_proj = x @ kernel + input_bias  # (batch, window, 3 * units), all timesteps at once
+    h = np.zeros((x.shape[0], units), dtype=np.float32)
+    for t in range(x.shape[1]):
+        xt = x_proj[:, t]
+        rec = h @ recurrent_kernel + recurrent_bias
+        zr = rec_act(xt[:, : 2 * units] + rec[:, : 2 * units])
+        z, r = zr[:, :units], zr[:, units:]
+        hh = act(xt[:, 2 * units :] + r * rec[:, 2 * units :])
+        h = hh + z * (h - hh)
+    return h
+
+
+def _lstm(x, kernel, recurrent_kernel, bias, entry) -> np.ndarray:
+    """Keras LSTM, gate order i, f, c, o."""
+    act = _ACTIVATIONS[entry["activation"]]
+    rec_act = _ACTIVATIONS[entry["recurrent_activation"]]
+    units = recurrent_kernel.shape[0]
+    x_proj = x @ kernel + bias
+    h = np.zeros((x.shape[0], units), dtype=np.float32)
+    c = np.zeros_like(h)
+    for t in range(x.shape[1]):
+        gates = x_proj[:, t] + h @ recurrent_kernel
+        i = rec_act(gates[:, :units])
+        f = rec_act(gates[:, units : 2 * units])
+        g = act(gates[:, 2 * units : 3 * units])
+        o = rec_act(gates[:, 3 * units :])
+        c = f * c + i * g
+        h = o * act(c)
+    return h
@@ -1,11 +1,21 @@
-"""Model persistence — save and load trained models and scalers."""
+"""Model persistence — save and load trained models and scalers.
+
+Scalers are stored as plain arrays in ``{model_name}_scalers.json`` and load
+as ``ArrayMinMaxScaler`` without scikit-learn. TensorFlow is imported inside
+``load_model`` only, so modules that merely reference these helpers (e.g. the
+registry serving the NumPy runtime) stay importable without it.
+"""
 
 from __future__ import annotations
 
+import json
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+from trillium_watts.models.scaling import ArrayMinMaxScaler
 
-import joblib
-from tensorflow.keras.models import Sequential, load_model as keras_load_model
+if TYPE_CHECKING:
+    from tensorflow.keras.models import Sequential
 
 
 def save_model(
@@ -20,20 +30,60 @@ def save_model(
     directory.mkdir(parents=True, exist_ok=True)
 
     model.save(directory / f"{model_name}.keras")
-    joblib.dump(scaler_X, directory / f"{model_name}_scaler_X.joblib")
-    joblib.dump(scaler_y, directory / f"{model_name}_scaler_y.joblib")
+    save_scalers(scaler_X, scaler_y, directory, model_name)
+
+
+def save_scalers(
+    scaler_X,
+    scaler_y,
+    directory: str | Path,
+    model_name: str = "best_model",
+) -> Path:
+    """Write both fitted min-max scalers as plain arrays to a JSON file."""
+    path = Path(directory) / f"{model_name}_scalers.json"
+    payload = {
+        "scaler_X": ArrayMinMaxScaler.from_scaler(scaler_X).to_dict(),
+        "scaler_y": ArrayMinMaxScaler.from_scaler(scaler_y).to_dict(),
+    }
+    with open(path, "w") as f:
+        json.dump(payload, f)
+    return path
 
 
 def load_model(
     directory: str | Path,
     model_name: str = "best_model",
-) -> tuple[Sequential, object, object]:
+) -> tuple[Sequential, ArrayMinMaxScaler, ArrayMinMaxScaler]:
     """Load a saved Keras model and its scalers.
 
     Returns (model, scaler_X, scaler_y).
     """
+    from tensorflow.keras.models import load_model as keras_load_model
+
     directory = Path(directory)
     model = keras_load_model(directory / f"{model_name}.keras")
+    scaler_X, scaler_y = load_scalers(directory, model_name)
+    return model, scaler_X, scaler_y
+
+
+def load_scalers(
+    directory: str | Path,
+    model_name: str = "best_model",
+) -> tuple[ArrayMinMaxScaler, ArrayMinMaxScaler]:
+    """Load the saved scalers only. Returns (scaler_X, scaler_y).
+
+    Artifacts saved before the JSON format fall back to the legacy joblib
+    pickles (which need scikit-learn to unpickle).
+    """
+    directory = Path(directory)
+    json_path = directory / f"{model_name}_scalers.json"
+    if json_path.exists():
+        with open(json_path) as f:
+            raw = json.load(f)
+        return ArrayMinMaxScaler.from_dict(raw["scaler_X"]), ArrayMinMaxScaler.from_dict(raw["scaler_y"])
+
+    import joblib
+
     scaler_X = joblib.load(directory / f"{model_name}_scaler_X.joblib")
     scaler_y = joblib.load(directory / f"{model_name}_scaler_y.joblib")
-    return model, scaler_X, scaler_y
+    return ArrayMinMaxScaler.from_scaler(scaler_X), ArrayMinMaxScaler.from_scaler(scaler_y)
@@ -0,0 +1,218 @@
+"""Versioned model registry — atomic writes, promote/rollback, metadata index.
+
+Layout under the registry root::
+
+    index.json              # {"current": ..., "history": [...], "versions": {...}}
+    versions/v0001/         # model.keras, model_scalers.json,
+    versions/v0002/         # model.npz (NumPy runtime, GRU/LSTM only), metadata.json
+    ...
+
+Every version is written to a hidden staging directory and renamed into
+place, and ``index.json`` is replaced with ``os.replace``, so a crash never
+leaves a half-written version or a mismatched model/scaler trio visible.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from trillium_watts.models.numpy_runtime import NumpyModel, export_numpy_weights
+from trillium_watts.models.persistence import load_model, load_scalers, save_model
+
+ARTIFACT_NAME = "model"
+INDEX_FILE = "index.json"
+VERSIONS_DIR = "versions"
+
+
+def hash_config(config) -> str:
+    """Return a short, stable SHA-256 of a config dataclass (or plain dict)."""
+    raw = dataclasses.asdict(config) if dataclasses.is_dataclass(config) else config
+    payload = json.dumps(raw, sort_keys=True, default=str).encode()
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def hash_array(data: np.ndarray) -> str:
+    """Return a short SHA-256 of an array's shape and contents."""
+    data = np.ascontiguousarray(data)
+    digest = hashlib.sha256(str(data.shape).encode())
+    digest.update(data.tobytes())
+    return digest.hexdigest()[:16]
+
+
+def _write_json_atomic(path: Path, payload: dict) -> None:
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(payload, f, indent=2, default=str)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class ModelRegistry:
+    """Versioned store of trained models, their scalers and metadata."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self.index_path = self.root / INDEX_FILE
+        self.versions_path = self.root / VERSIONS_DIR
+
+    # --- index -------------------------------------------------------------
+
+    def _read_index(self) -> dict:
+        if not self.index_path.exists():
+            return {"current": None, "history": [], "versions": {}}
+        with open(self.index_path) as f:
+            return json.load(f)
+
+    def exists(self) -> bool:
+        """Return True if at least one version has been registered."""
+        return self.index_path.exists()
+
+    def current_version(self) -> str | None:
+        """Return the currently promoted version (one small index read)."""
+        return self._read_index()["current"]
+
+    def list_versions(self) -> list[str]:
+        """Return all registered versions, oldest first."""
+        return sorted(self._read_index()["versions"])
+
+    def metadata(self, version: str | None = None) -> dict:
+        """Return the metadata recorded for ``version`` (default: current)."""
+        index = self._read_index()
+        version = version or index["current"]
+        if version not in index["versions"]:
+            raise KeyError(f"Unknown model version '{version}'")
+        return index["versions"][version]
+
+    def version_path(self, version: str) -> Path:
+        return self.versions_path / version
+
+    # --- writes ------------------------------------------------------------
+
+    def register(
+        self,
+        model,
+        scaler_X,
+        scaler_y,
+        metadata: dict | None = None,
+        promote: bool = True,
+    ) -> str:
+        """Write a new version atomically and (by default) promote it.
+
+        Returns the new version id, e.g. ``"v0003"``.
+        """
+        self.versions_path.mkdir(parents=True, exist_ok=True)
+        index = self._read_index()
+        existing = [int(v[1:]) for v in index["versions"]]
+        version = f"v{max(existing, default=0) + 1:04d}"
+
+        metadata = {
+            **(metadata or {}),
+            "version": version,
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+
+        staging = self.versions_path / f".{version}.{uuid.uuid4().hex}.staging"
+        try:
+            save_model(model, scaler_X, scaler_y, staging, model_name=ARTIFACT_NAME)
+            try:
+                export_numpy_weights(model, staging / f"{ARTIFACT_NAME}.npz")
+                metadata["numpy_runtime"] = True
+            except ValueError:
+                metadata["numpy_runtime"] = False
+            _write_json_atomic(staging / "metadata.json", metadata)
+            os.replace(staging, self.version_path(version))
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        index["versions"][version] = metadata
+        if promote:
+            index["current"] = version
+            index["history"].append(version)
+        _write_json_atomic(self.index_path, index)
+        return version
+
+    def promote(self, version: str) -> None:
+        """Make ``version`` the current one."""
+        index = self._read_index()
+        if version not in index["versions"]:
+            raise KeyError(f"Unknown model version '{version}'")
+        index["current"] = version
+        index["history"].append(version)
+        _write_json_atomic(self.index_path, index)
+
+    def rollback(self) -> str:
+        """Re-promote the previously current version and return it."""
+        index = self._read_index()
+        if len(index["history"]) < 2:
+            raise RuntimeError("No previous version to roll back to.")
+        index["history"].pop()
+        index["current"] = index["history"][-1]
+        _write_json_atomic(self.index_path, index)
+        return index["current"]
+
+    # --- reads -------------------------------------------------------------
+
+    def load(
+        self,
+        version: str | None = None,
+        runtime: str = "keras",
+    ) -> tuple[object, object, object]:
+        """Load ``(model, scaler_X, scaler_y)`` for ``version`` (default: current).
+
+        With ``runtime="numpy"`` the model is a ``NumpyModel`` and TensorFlow
+        is never imported; ``runtime="auto"`` uses it when the version has an
+        exported ``.npz`` and falls back to Keras otherwise.
+        """
+        if runtime not in ("keras", "numpy", "auto"):
+            raise ValueError(f"Unknown runtime '{runtime}'. Choose from ['keras', 'numpy', 'auto']")
+        version = version or self.current_version()
+        if version is None:
+            raise FileNotFoundError(f"No model promoted in registry {self.root}")
+        directory = self.version_path(version)
+        npz_path = directory / f"{ARTIFACT_NAME}.npz"
+        if runtime == "numpy" or (runtime == "auto" and npz_path.exists()):
+            return (NumpyModel.load(npz_path), *load_scalers(directory, ARTIFACT_NAME))
+        return load_model(directory, model_name=ARTIFACT_NAME)
+
+
+class LiveModel:
+    """Hot-reloading handle on the registry's current version.
+
+    ``get()`` is cheap when nothing changed (a ``stat`` of the index, which is
+    replaced with a fresh inode on every write). When a new version is
+    promoted it is loaded in full before the reference is swapped, so
+    concurrent readers always see a consistent
+    ``(version, model, scaler_X, scaler_y)`` tuple.
+    """
+
+    def __init__(self, registry: ModelRegistry, runtime: str = "keras"):
+        self.registry = registry
+        self.runtime = runtime
+        self._lock = threading.Lock()
+        self._index_stamp: tuple[int, int] | None = None
+        self._loaded: tuple | None = None
+
+    def get(self) -> tuple[str, object, object, object]:
+        """Return ``(version, model, scaler_X, scaler_y)``, reloading if needed."""
+        stat = self.registry.index_path.stat()
+        stamp = (stat.st_ino, stat.st_mtime_ns)
+        if self._loaded is not None and stamp == self._index_stamp:
+            return self._loaded
+        with self._lock:
+            version = self.registry.current_version()
+            if self._loaded is None or self._loaded[0] != version:
+                self._loaded = (version, *self.registry.load(version, runtime=self.runtime))
+            self._index_stamp = stamp
+            return self._loaded
@@ -0,0 +1,56 @@
+"""Portable min-max scaling parameters stored as plain arrays.
+
+``ArrayMinMaxScaler`` mirrors the fitted attributes and ``transform`` /
+``inverse_transform`` of scikit-learn's ``MinMaxScaler`` but is built from
+plain arrays, serialises to JSON and never imports scikit-learn, so model
+artifacts can be loaded by the NumPy runtime and the dashboard.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+class ArrayMinMaxScaler:
+    """Fitted min-max scaler defined by ``data_min_`` and ``data_max_``."""
+
+    def __init__(
+        self,
+        data_min: np.ndarray,
+        data_max: np.ndarray,
+        feature_range: tuple[float, float] = (0.0, 1.0),
+    ):
+        self.data_min_ = np.asarray(data_min, dtype=np.float64)
+        self.data_max_ = np.asarray(data_max, dtype=np.float64)
+        self.feature_range = (float(feature_range[0]), float(feature_range[1]))
+        self.data_range_ = self.data_max_ - self.data_min_
+        # Same zero-range handling as scikit-learn (constant columns scale by 1)
+        safe_range = np.where(self.data_range_ == 0.0, 1.0, self.data_range_)
+        self.scale_ = (self.feature_range[1] - self.feature_range[0]) / safe_range
+        self.min_ = self.feature_range[0] - self.data_min_ * self.scale_
+
+    @property
+    def n_features_in_(self) -> int:
+        return len(self.data_min_)
+
+    @classmethod
+    def from_scaler(cls, scaler) -> ArrayMinMaxScaler:
+        """Build from any fitted ``MinMaxScaler``-like object."""
+        return cls(scaler.data_min_, scaler.data_max_, getattr(scaler, "feature_range", (0.0, 1.0)))
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        return np.asarray(X, dtype=np.float64) * self.scale_ + self.min_
+
+    def inverse_transform(self, X: np.ndarray) -> np.ndarray:
+        return (np.asarray(X, dtype=np.float64) - self.min_) / self.scale_
+
+    def to_dict(self) -> dict:
+        return {
+            "data_min": self.data_min_.tolist(),
+            "data_max": self.data_max_.tolist(),
+            "feature_range": list(self.feature_range),
+        }
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> ArrayMinMaxScaler:
+        return cls(raw["data_min"], raw["data_max"], tuple(raw["feature_range"]))
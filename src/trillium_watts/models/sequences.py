@@ -10,6 +10,7 @@ def create_sequences(
     data: np.ndarray,
     window_size: int,
     target_index: int,
+    horizon: int = 1,
 ) -> tuple[np.ndarray, np.ndarray]:
     """Create sliding window sequences for time series modelling.
 
@@ -17,15 +18,21 @@ def create_sequences(
         data: 2D array of shape (n_timesteps, n_features).
         window_size: Number of past timesteps in each input window.
         target_index: Column index of the target variable in ``data``.
+        horizon: Number of future steps per target. With ``horizon > 1``
+            each sample targets the next ``horizon`` values (direct
+            multi-step models).
 
     Returns:
         X: 3D array of shape (n_samples, window_size, n_features).
-        y: 1D array of shape (n_samples,).
+        y: 1D array of shape (n_samples,), or (n_samples, horizon) if ``horizon > 1``.
     """
     X, y = [], []
-    for i in range(len(data) - window_size):
+    for i in range(len(data) - window_size - horizon + 1):
         X.append(data[i : i + window_size])
-        y.append(data[i + window_size, target_index])
+        if horizon == 1:
+            y.append(data[i + window_size, target_index])
+        else:
+            y.append(data[i + window_size : i + window_size + horizon, target_index])
     return np.array(X), np.array(y)
 
 
@@ -45,7 +52,8 @@ def fit_scalers(
 ) -> tuple[MinMaxScaler, MinMaxScaler]:
     """Fit MinMaxScalers on training data.
 
-    X is reshaped to 2D for fitting, y is reshaped to (n, 1).
+    X is reshaped to 2D for fitting, y is reshaped to (n, 1) — multi-step
+    targets share a single target scaler.
     """
     scaler_X = MinMaxScaler()
     scaler_X.fit(X_train.reshape(-1, X_train.shape[2]))
@@ -65,5 +73,5 @@ def apply_scalers(
     """Transform data using fitted scalers."""
     n_samples, window, n_features = X.shape
     X_scaled = scaler_X.transform(X.reshape(-1, n_features)).reshape(n_samples, window, n_features)
-    y_scaled = scaler_y.transform(y.reshape(-1, 1)).flatten()
+    y_scaled = scaler_y.transform(y.reshape(-1, 1)).reshape(y.shape)
     return X_scaled, y_scaled
@@ -2,14 +2,34 @@
 
 from __future__ import annotations
 
+import time
+
 import numpy as np
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 from sklearn.model_selection import ParameterGrid
 from sklearn.preprocessing import MinMaxScaler
-from tensorflow.keras.callbacks import EarlyStopping
-from tensorflow.keras.models import Sequential
+from tensorflow.keras.callbacks import Callback, EarlyStopping
+from tensorflow.keras.models import Model, Sequential
+
+from trillium_watts.models.architectures import build_ensemble_model, build_model
+
+
+class EpochTimer(Callback):
+    """Keras callback that records the wall-clock duration of every epoch."""
+
+    def on_train_begin(self, logs=None):
+        self.epoch_times = []
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._start = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        self.epoch_times.append(time.perf_counter() - self._start)
+
 
-from trillium_watts.models.architectures import build_model
+def _output_steps(y: np.ndarray) -> int:
+    """Number of target steps: 1 for ``(n,)`` targets, ``horizon`` for ``(n, horizon)``."""
+    return 1 if y.ndim == 1 else y.shape[1]
 
 
 def grid_search(
@@ -24,9 +44,10 @@ def grid_search(
     """Run grid search over hyperparameters.
 
     Returns a list of result dicts, each containing:
-        params, val_mae, val_loss, epochs_ran, history
+        params, val_mae, val_loss, epochs_ran, epoch_time, history
     """
     input_shape = (X_train.shape[1], X_train.shape[2])
+    output_steps = _output_steps(y_train)
     results = []
 
     for params in ParameterGrid(param_grid):
@@ -36,6 +57,7 @@ def grid_search(
             dropout=params["dropout"],
             learning_rate=params["learning_rate"],
             input_shape=input_shape,
+            output_steps=output_steps,
         )
 
         early_stop = EarlyStopping(
@@ -44,13 +66,14 @@ def grid_search(
             restore_best_weights=True,
         )
 
+        timer = EpochTimer()
         history = model.fit(
             X_train,
             y_train,
             validation_data=(X_test, y_test),
             epochs=params["epochs"],
             batch_size=params["batch_size"],
-            callbacks=[early_stop],
+            callbacks=[early_stop, timer],
             verbose=1,
         )
 
@@ -61,6 +84,7 @@ def grid_search(
                 "val_mae": val_mae,
                 "val_loss": min(history.history["val_loss"]),
                 "epochs_ran": len(history.history["val_mae"]),
+                "epoch_time": float(np.mean(timer.epoch_times)),
                 "history": history.history,
             }
         )
@@ -68,6 +92,53 @@ def grid_search(
     return results
 
 
+def benchmark_architectures(
+    model_types: list[str],
+    param_grid: dict,
+    X_train: np.ndarray,
+    y_train: np.ndarray,
+    X_test: np.ndarray,
+    y_test: np.ndarray,
+    early_stopping_patience: int = 10,
+) -> list[dict]:
+    """Grid-search every architecture and report accuracy against throughput.
+
+    Returns one dict per architecture with its best ``params``, ``val_mae``,
+    mean ``epoch_time`` (seconds) and ``predict_time`` (seconds per test-set
+    pass, timed on a direct batched call).
+    """
+    rows = []
+    for model_type in model_types:
+        best = select_best_params(
+            grid_search(
+                model_type, param_grid, X_train, y_train, X_test, y_test,
+                early_stopping_patience=early_stopping_patience,
+            )
+        )
+        model = build_model(
+            model_type,
+            units=best["params"]["units"],
+            dropout=best["params"]["dropout"],
+            learning_rate=best["params"]["learning_rate"],
+            input_shape=(X_train.shape[1], X_train.shape[2]),
+            output_steps=_output_steps(y_train),
+        )
+        model(X_test[:1], training=False)
+        start = time.perf_counter()
+        model(X_test, training=False)
+        rows.append(
+            {
+                "model_type": model_type,
+                "params": best["params"],
+                "val_mae": best["val_mae"],
+                "epochs_ran": best["epochs_ran"],
+                "epoch_time": best["epoch_time"],
+                "predict_time": time.perf_counter() - start,
+            }
+        )
+    return rows
+
+
 def select_best_params(results: list[dict], metric: str = "val_mae") -> dict:
     """Select the best hyperparameters from grid search results."""
     best = min(results, key=lambda r: r[metric])
@@ -91,6 +162,7 @@ def retrain_final_model(
         dropout=params["dropout"],
         learning_rate=params["learning_rate"],
         input_shape=input_shape,
+        output_steps=_output_steps(y_all),
     )
 
     model.fit(
@@ -105,21 +177,76 @@ def retrain_final_model(
     return model
 
 
+def retrain_final_ensemble(
+    model_type: str,
+    best_params: dict,
+    X_all: np.ndarray,
+    y_all: np.ndarray,
+    n_members: int,
+    early_stopping_patience: int = 10,
+) -> Model:
+    """Retrain ``n_members`` seed-varied models at once as a stacked ensemble.
+
+    All members share one graph and one ``fit`` call, so the wall time stays
+    close to that of ``retrain_final_model`` for a single model.
+    """
+    if y_all.ndim != 1:
+        raise ValueError("Ensembles support single-step targets only.")
+    params = best_params["params"]
+    input_shape = (X_all.shape[1], X_all.shape[2])
+
+    model = build_ensemble_model(
+        model_type,
+        n_members,
+        units=params["units"],
+        dropout=params["dropout"],
+        learning_rate=params["learning_rate"],
+        input_shape=input_shape,
+    )
+
+    model.fit(
+        X_all,
+        np.repeat(y_all.reshape(-1, 1), n_members, axis=1),
+        epochs=params["epochs"],
+        batch_size=params["batch_size"],
+        callbacks=[EarlyStopping(monitor="loss", patience=early_stopping_patience, restore_best_weights=True)],
+        verbose=0,
+    )
+
+    return model
+
+
+def predict_with_spread(model: Model, X: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Run one batched forward pass and return the member mean and std.
+
+    Works for single models too (the spread is then zero).
+    """
+    preds = np.asarray(model(X, training=False)).reshape(len(X), -1)
+    return preds.mean(axis=1), preds.std(axis=1)
+
+
 def evaluate_model(
     model: Sequential,
     X_test: np.ndarray,
     y_test: np.ndarray,
     scaler_y: MinMaxScaler,
 ) -> dict[str, float]:
-    """Compute MAE, RMSE, and R2 on the test set (inverse-scaled)."""
-    y_pred_scaled = model.predict(X_test).flatten()
-    y_pred = scaler_y.inverse_transform(y_pred_scaled.reshape(-1, 1)).flatten()
-    y_true = scaler_y.inverse_transform(y_test.reshape(-1, 1)).flatten()
+    """Compute MAE, RMSE, and R2 on the test set (inverse-scaled).
+
+    Ensemble outputs are averaged across members. For direct multi-step
+    targets of shape (n, horizon) the metrics pool every step, and
+    ``y_pred``/``y_true`` keep the (n, horizon) shape.
+    """
+    y_pred_scaled = model.predict(X_test)
+    if y_test.ndim == 1:
+        y_pred_scaled = y_pred_scaled.reshape(len(X_test), -1).mean(axis=1)
+    y_pred = scaler_y.inverse_transform(y_pred_scaled.reshape(-1, 1)).reshape(y_test.shape)
+    y_true = scaler_y.inverse_transform(y_test.reshape(-1, 1)).reshape(y_test.shape)
 
     return {
-        "mae": mean_absolute_error(y_true, y_pred),
-        "rmse": float(np.sqrt(mean_squared_error(y_true, y_pred))),
-        "r2": r2_score(y_true, y_pred),
+        "mae": mean_absolute_error(y_true.ravel(), y_pred.ravel()),
+        "rmse": float(np.sqrt(mean_squared_error(y_true.ravel(), y_pred.ravel()))),
+        "r2": r2_score(y_true.ravel(), y_pred.ravel()),
         "y_pred": y_pred,
         "y_true": y_true,
     }
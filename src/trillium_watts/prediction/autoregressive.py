@@ -1,96 +1,314 @@
-"""Autoregressive multi-step forecasting."""
+"""Autoregressive multi-step forecasting.
+
+The recursion runs on a preallocated (batch, window + steps, features)
+buffer: future calendar rows are computed up front, each step's prediction is
+min-max scaled arithmetically and written into the buffer in place, and the
+model is called directly through a cached compiled function. The batch
+dimension lets callers roll out many origins or sample paths at once.
+"""
 
 from __future__ import annotations
 
+import weakref
+from collections.abc import Callable
 from datetime import timedelta
 
 import numpy as np
 import pandas as pd
-from sklearn.preprocessing import MinMaxScaler
 
-from trillium_watts.features.cyclic import compute_cyclic_for_date
+from trillium_watts.features.pipeline import build_calendar_features
+from trillium_watts.models.numpy_runtime import NumpyModel, member_count
+from trillium_watts.models.scaling import ArrayMinMaxScaler
+
+
+_FORWARD_CACHE: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def make_forward_fn(
+    model,
+    training: bool = False,
+    rng: np.random.Generator | None = None,
+) -> Callable[[np.ndarray], np.ndarray]:
+    """Return a low-overhead batched forward function for ``model``.
+
+    The function maps inputs of shape (batch, window, features) to member
+    outputs of shape (batch, n_members). Keras models are wrapped once in a
+    ``tf.function`` direct call (no ``model.predict`` per-call setup) and the
+    wrapper is cached per model; ``NumpyModel`` runs its own forward pass.
+    ``training=True`` keeps dropout active (Monte Carlo dropout); ``rng``
+    seeds the NumPy runtime's dropout masks.
+    """
+    if isinstance(model, NumpyModel):
+        return lambda x: model.predict(x, training=training, rng=rng)
+
+    per_model = _FORWARD_CACHE.setdefault(model, {})
+    if training not in per_model:
+        import tensorflow as tf
+
+        # Only a weak reference: the cached value must not keep its key alive
+        model_ref = weakref.ref(model)
+        compiled = tf.function(lambda x: model_ref()(x, training=training), reduce_retracing=True)
+        per_model[training] = lambda x: compiled(tf.constant(x, dtype=tf.float32)).numpy().reshape(len(x), -1)
+    return per_model[training]
+
+
+def _walk_layers(layer):
+    """``layer`` and every layer nested in it (sub-models, RNN cells)."""
+    yield layer
+    for child in getattr(layer, "layers", []):
+        yield from _walk_layers(child)
+    cell = getattr(layer, "cell", None)
+    if cell is not None:
+        yield from _walk_layers(cell)
+
+
+def _seed_keras_dropout(model, seed: int) -> None:
+    """Make a Keras model's dropout masks reproducible for ``seed``.
+
+    Keras 3 layers draw masks from their own ``SeedGenerator``, so each
+    generator in the model (ensemble members included) is re-seeded in
+    place. This overwrites the model's generator state: later unseeded
+    calls continue from ``seed`` rather than from where they left off.
+    """
+    for i, layer in enumerate(_walk_layers(model)):
+        generator = getattr(layer, "seed_generator", None)
+        if generator is not None:
+            generator.state.assign(np.array([seed, i], dtype=generator.state.dtype))
+
+
+def build_future_rows(
+    last_row_unscaled: np.ndarray,
+    future_dates: pd.DatetimeIndex,
+    features_list: list[str],
+    scaler_X: ArrayMinMaxScaler,
+) -> np.ndarray:
+    """Scaled feature rows for the forecast dates, shape (num_steps, n_features).
+
+    Calendar (temporal and cyclic) columns come from the dates; every other
+    feature is carried forward from the last observed row. The target column
+    is left as carried forward and overwritten step by step by the rollout.
+    """
+    rows = np.repeat(np.asarray(last_row_unscaled, dtype=np.float64)[None, :], len(future_dates), axis=0)
+    calendar = build_calendar_features(future_dates)
+    for i, feat in enumerate(features_list):
+        if feat in calendar:
+            rows[:, i] = calendar[feat]
+    return rows * scaler_X.scale_ + scaler_X.min_
+
+
+def rollout(
+    forward: Callable[[np.ndarray], np.ndarray],
+    windows_scaled: np.ndarray,
+    future_rows_scaled: np.ndarray,
+    tgt_idx: int,
+    scaler_X: ArrayMinMaxScaler,
+    scaler_y: ArrayMinMaxScaler | None = None,
+    noise: np.ndarray | None = None,
+    n_members: int | None = None,
+) -> np.ndarray:
+    """Batched autoregressive recursion over a preallocated sliding buffer.
+
+    Args:
+        forward: Batched forward function (see ``make_forward_fn``).
+        windows_scaled: Initial windows, shape (batch, window_size, n_features).
+        future_rows_scaled: Scaled rows for the forecast steps, shape
+            (num_steps, n_features) shared by the batch or
+            (batch, num_steps, n_features).
+        tgt_idx: Column index of the target in the feature rows.
+        scaler_X: Feature scaler (the target column maps predictions back
+            into the input space).
+        scaler_y: Target scaler the model was trained with; if None,
+            ``scaler_X``'s target column is used.
+        noise: Optional unscaled perturbations of shape (batch, num_steps)
+            added to every prediction before it is fed back (e.g.
+            bootstrapped residuals for sample paths).
+        n_members: Expected output width (``member_count(model)``); a
+            different width means the model is not a one-step forecaster
+            (e.g. a direct multi-horizon head) and raises ``ValueError``.
+
+    Returns:
+        Unscaled member predictions of shape (batch, num_steps, n_members).
+        The member mean of each step is written into the buffer in place and
+        becomes part of the next step's window.
+    """
+    batch, window_size, n_features = windows_scaled.shape
+    num_steps = future_rows_scaled.shape[-2]
+    if scaler_y is not None:
+        y_min, y_range = scaler_y.data_min_[0], scaler_y.data_range_[0]
+    else:
+        y_min, y_range = scaler_X.data_min_[tgt_idx], scaler_X.data_range_[tgt_idx]
+    x_scale, x_min = scaler_X.scale_[tgt_idx], scaler_X.min_[tgt_idx]
+
+    buffer = np.empty((batch, window_size + num_steps, n_features), dtype=np.float32)
+    buffer[:, :window_size] = windows_scaled
+    buffer[:, window_size:] = future_rows_scaled
+
+    outputs = None
+    for t in range(num_steps):
+        members = forward(buffer[:, t : t + window_size])
+        if n_members is not None and members.shape[1] != n_members:
+            raise ValueError(
+                f"Model returns {members.shape[1]} outputs per window, expected {n_members} one-step "
+                "member(s); direct multi-horizon models must use predict_direct."
+            )
+        members = members * y_range + y_min
+        if noise is not None:
+            members += noise[:, t, None]
+        if outputs is None:
+            outputs = np.empty((batch, num_steps, members.shape[1]))
+        outputs[:, t] = members
+        buffer[:, window_size + t, tgt_idx] = members.mean(axis=1) * x_scale + x_min
+    return outputs if outputs is not None else np.empty((batch, 0, 1))
+
+
+def _rollout(
+    model,
+    initial_sequence_scaled: np.ndarray,
+    num_steps: int,
+    scaler_X: ArrayMinMaxScaler,
+    last_date,
+    target_name: str,
+    features_list: list[str] | None,
+    scaler_y: ArrayMinMaxScaler | None = None,
+) -> tuple[pd.DatetimeIndex, np.ndarray]:
+    """Single-origin rollout; return future dates and (num_steps, n_members) predictions."""
+    if features_list is None:
+        raise ValueError("features_list must be provided.")
+
+    tgt_idx = features_list.index(target_name)
+    future_dates = pd.date_range(last_date + timedelta(days=1), periods=num_steps, freq="D")
+    last_unscaled = scaler_X.inverse_transform(initial_sequence_scaled[0, -1:])[0]
+    future_rows = build_future_rows(last_unscaled, future_dates, features_list, scaler_X)
+    members = rollout(
+        make_forward_fn(model), initial_sequence_scaled, future_rows, tgt_idx, scaler_X, scaler_y,
+        n_members=member_count(model),
+    )
+    return future_dates, members[0]
 
 
 def predict_future(
     model,
     initial_sequence_scaled: np.ndarray,
     num_steps: int,
-    scaler_X: MinMaxScaler,
+    scaler_X: ArrayMinMaxScaler,
     features_df: pd.DataFrame,
     target_name: str = "ACTIVA",
     features_list: list[str] | None = None,
+    scaler_y: ArrayMinMaxScaler | None = None,
 ) -> pd.Series:
     """Autoregressive multi-step prediction.
 
     Uses the trained model to predict the next day, then feeds that prediction
-    back as input for subsequent days.
+    back as input for subsequent days. For stacked ensembles the member mean
+    is used.
 
     Args:
-        model: Trained Keras model.
+        model: Trained Keras model (single or stacked ensemble).
         initial_sequence_scaled: Shape (1, window_size, n_features), already scaled.
         num_steps: Number of future days to predict.
         scaler_X: Fitted MinMaxScaler for features.
         features_df: DataFrame with historical data (used for last date and feature order).
         target_name: Name of the target column.
         features_list: Ordered list of feature column names.
+        scaler_y: Fitted target scaler; if None, ``scaler_X``'s target column is used.
 
     Returns:
         pd.Series indexed by future dates with unscaled predicted values.
     """
-    if features_list is None:
-        raise ValueError("features_list must be provided.")
+    future_dates, members = _rollout(
+        model, initial_sequence_scaled, num_steps, scaler_X, features_df.index[-1], target_name, features_list, scaler_y
+    )
+    return pd.Series(members.mean(axis=1), index=future_dates)
 
-    idx_map = {feat: i for i, feat in enumerate(features_list)}
-    tgt_idx = idx_map[target_name]
-    data_min = scaler_X.data_min_
-    data_range = scaler_X.data_range_
 
-    current_input = initial_sequence_scaled.copy()
-    last_unscaled = scaler_X.inverse_transform(current_input[0, -1].reshape(1, -1))[0]
-    last_date = features_df.index[-1]
+def predict_future_with_spread(
+    model,
+    initial_sequence_scaled: np.ndarray,
+    num_steps: int,
+    scaler_X: ArrayMinMaxScaler,
+    features_df: pd.DataFrame,
+    target_name: str = "ACTIVA",
+    features_list: list[str] | None = None,
+    scaler_y: ArrayMinMaxScaler | None = None,
+) -> pd.DataFrame:
+    """Autoregressive prediction with an ensemble, reporting member spread.
 
-    future_scaled = []
-    for i in range(num_steps):
-        pred_scaled = model.predict(current_input, verbose=0)[0, 0]
-        future_scaled.append(pred_scaled)
+    Same arguments as ``predict_future``. Returns a DataFrame indexed by
+    future dates with unscaled ``mean`` and ``std`` columns.
+    """
+    future_dates, members = _rollout(
+        model, initial_sequence_scaled, num_steps, scaler_X, features_df.index[-1], target_name, features_list, scaler_y
+    )
+    return pd.DataFrame({"mean": members.mean(axis=1), "std": members.std(axis=1)}, index=future_dates)
+
+
+def quantile_label(q: float) -> str:
+    """Column label for a quantile, e.g. 0.1 -> ``"P10"``."""
+    return f"P{round(q * 100):d}"
+
+
+def predict_future_quantiles(
+    model,
+    initial_sequence_scaled: np.ndarray,
+    num_steps: int,
+    scaler_X: ArrayMinMaxScaler,
+    features_df: pd.DataFrame,
+    target_name: str = "ACTIVA",
+    features_list: list[str] | None = None,
+    scaler_y: ArrayMinMaxScaler | None = None,
+    n_samples: int = 200,
+    quantiles: tuple[float, ...] = (0.1, 0.5, 0.9),
+    residuals: np.ndarray | None = None,
+    seed: int | None = None,
+) -> pd.DataFrame:
+    """Probabilistic forecast from Monte Carlo dropout sample paths.
 
-        unscaled_target = pred_scaled * data_range[tgt_idx] + data_min[tgt_idx]
+    ``n_samples`` copies of the initial window are rolled out as one batch
+    with dropout active, so each path sees different dropout masks and feeds
+    back its own predictions. If ``residuals`` (unscaled one-step errors,
+    e.g. from ``evaluate_model`` or a backtest) are given, a bootstrapped
+    residual is added at every step as well. ``seed`` fixes the residual
+    bootstrap and the dropout masks for both runtimes.
 
-        date = last_date + timedelta(days=i + 1)
-        cyc = compute_cyclic_for_date(date)
+    Returns:
+        DataFrame indexed by future dates with a ``mean`` column and one
+        column per quantile (``P10``, ``P50``, ``P90`` by default).
+    """
+    if features_list is None:
+        raise ValueError("features_list must be provided.")
 
-        new_unscaled = last_unscaled.copy()
-        new_unscaled[tgt_idx] = unscaled_target
+    rng = np.random.default_rng(seed)
+    tgt_idx = features_list.index(target_name)
+    last_date = features_df.index[-1]
+    future_dates = pd.date_range(last_date + timedelta(days=1), periods=num_steps, freq="D")
+    last_unscaled = scaler_X.inverse_transform(initial_sequence_scaled[0, -1:])[0]
+    future_rows = build_future_rows(last_unscaled, future_dates, features_list, scaler_X)
 
-        # Update temporal and cyclic features
-        temporal_values = {
-            "year": date.year,
-            "month": date.month,
-            "dayofyear": date.timetuple().tm_yday,
-            "weekday": date.weekday(),
-            "weekofyear": date.isocalendar().week,
-        }
-        for feat, val in {**temporal_values, **cyc}.items():
-            if feat in idx_map:
-                new_unscaled[idx_map[feat]] = val
+    noise = None
+    if residuals is not None:
+        noise = rng.choice(np.asarray(residuals, dtype=np.float64), size=(n_samples, num_steps))
 
-        new_scaled = scaler_X.transform(new_unscaled.reshape(1, -1))[0]
-        current_input = np.concatenate(
-            [current_input[:, 1:, :], new_scaled.reshape(1, 1, -1)],
-            axis=1,
-        )
-        last_unscaled = new_unscaled
+    windows = np.repeat(initial_sequence_scaled[:1], n_samples, axis=0)
+    if seed is not None and not isinstance(model, NumpyModel):
+        _seed_keras_dropout(model, seed)
+    members = rollout(
+        make_forward_fn(model, training=True, rng=rng),
+        windows, future_rows, tgt_idx, scaler_X, scaler_y, noise, n_members=member_count(model),
+    )
+    paths = members.mean(axis=2)
 
-    future_unscaled = np.array(future_scaled) * data_range[tgt_idx] + data_min[tgt_idx]
-    future_dates = [last_date + timedelta(days=i + 1) for i in range(num_steps)]
-    return pd.Series(future_unscaled, index=future_dates)
+    bands = np.quantile(paths, quantiles, axis=0)
+    result = pd.DataFrame({"mean": paths.mean(axis=0)}, index=future_dates)
+    for q, band in zip(quantiles, bands):
+        result[quantile_label(q)] = band
+    return result
 
 
 def prepare_initial_sequence(
     df: pd.DataFrame,
     features: list[str],
     window_size: int,
-    scaler_X: MinMaxScaler,
+    scaler_X: ArrayMinMaxScaler,
 ) -> np.ndarray:
     """Extract and scale the last ``window_size`` rows as the initial input.
 
@@ -0,0 +1,147 @@
+"""Batched multi-origin backtesting of the autoregressive forecaster.
+
+Every historical origin becomes one row of the rollout batch, so the full
+recursion for thousands of origins costs ``horizon`` batched forward passes
+per chunk instead of one ``predict_future`` call per origin.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from trillium_watts.features.pipeline import build_calendar_features
+from trillium_watts.models.numpy_runtime import member_count
+from trillium_watts.models.scaling import ArrayMinMaxScaler
+from trillium_watts.prediction.autoregressive import make_forward_fn, rollout
+
+
+@dataclass
+class BacktestResult:
+    """Forecasts and actuals for every origin, shape (n_origins, horizon)."""
+
+    origin_dates: np.ndarray
+    predictions: np.ndarray
+    actuals: np.ndarray
+
+    @property
+    def horizon(self) -> int:
+        return self.predictions.shape[1]
+
+    def metrics(self) -> pd.DataFrame:
+        """Per-horizon MAE, RMSE and MAPE (%) across all origins."""
+        errors = self.predictions - self.actuals
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ape = np.abs(errors) / np.abs(self.actuals)
+        return pd.DataFrame(
+            {
+                "mae": np.abs(errors).mean(axis=0),
+                "rmse": np.sqrt((errors**2).mean(axis=0)),
+                "mape": np.nanmean(np.where(np.isfinite(ape), ape, np.nan), axis=0) * 100,
+            },
+            index=pd.RangeIndex(1, self.horizon + 1, name="horizon"),
+        )
+
+    def save(self, path: str | Path) -> Path:
+        """Store the result as a compressed float32 ``.npz``."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            path,
+            origin_dates=self.origin_dates.astype("datetime64[D]"),
+            predictions=self.predictions.astype(np.float32),
+            actuals=self.actuals.astype(np.float32),
+        )
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path) -> BacktestResult:
+        with np.load(path) as data:
+            return cls(data["origin_dates"], data["predictions"], data["actuals"])
+
+
+def backtest(
+    model,
+    df: pd.DataFrame,
+    features: list[str],
+    target: str,
+    window_size: int,
+    scaler_X: ArrayMinMaxScaler,
+    scaler_y: ArrayMinMaxScaler | None = None,
+    horizon: int = 30,
+    stride: int = 1,
+    start: str | pd.Timestamp | None = None,
+    batch_size: int = 1024,
+    forecast_mode: str = "autoregressive",
+) -> BacktestResult:
+    """Roll the autoregressive forecaster out from many historical origins at once.
+
+    As in production, non-calendar exogenous features are carried forward
+    from each origin's last observed row and calendar features follow the
+    forecast dates. ``df`` must be a contiguous daily series. With
+    ``forecast_mode="direct"`` each origin's window goes through one
+    forward pass and the first ``horizon`` outputs are scored, as in
+    ``predict_direct``.
+
+    Args:
+        model: Keras model or ``NumpyModel`` (ensembles use the member mean).
+        df: Processed history containing ``features``.
+        features: Ordered feature columns.
+        target: Target column name.
+        window_size: Input window length.
+        scaler_X: Feature scaler used in training.
+        scaler_y: Target scaler used in training.
+        horizon: Steps to forecast from each origin.
+        stride: Keep every ``stride``-th origin.
+        start: Earliest origin date (default: first with a full window).
+        batch_size: Origins per rollout chunk, bounds peak memory.
+        forecast_mode: "autoregressive" or "direct" (the registry metadata
+            ``forecast_mode`` of the model).
+    """
+    if forecast_mode not in ("autoregressive", "direct"):
+        raise ValueError(f"Unknown forecast_mode '{forecast_mode}'. Available: autoregressive, direct")
+    if forecast_mode == "direct" and scaler_y is None:
+        raise ValueError("Direct models need the target scaler (scaler_y).")
+    values = df[features].to_numpy(dtype=np.float64)
+    tgt_idx = features.index(target)
+    last_origin = len(df) - horizon - 1
+    first_origin = window_size - 1
+    if start is not None:
+        first_origin = max(first_origin, int(df.index.searchsorted(pd.Timestamp(start))))
+    origins = np.arange(first_origin, last_origin + 1, stride)
+    if len(origins) == 0:
+        raise ValueError("Not enough history for a single backtest origin.")
+
+    scaled = (values * scaler_X.scale_ + scaler_X.min_).astype(np.float32)
+    windows = sliding_window_view(scaled, (window_size, len(features)))[:, 0]
+    calendar = build_calendar_features(df.index)
+    calendar_cols = [(i, calendar[f]) for i, f in enumerate(features) if f in calendar]
+    steps = np.arange(1, horizon + 1)
+
+    forward = make_forward_fn(model)
+    predictions = np.empty((len(origins), horizon))
+    for lo in range(0, len(origins), batch_size):
+        chunk = origins[lo : lo + batch_size]
+        if forecast_mode == "direct":
+            outputs = forward(windows[chunk - window_size + 1])
+            if outputs.shape[1] < horizon:
+                raise ValueError(f"Model predicts {outputs.shape[1]} steps, {horizon} requested.")
+            predictions[lo : lo + len(chunk)] = outputs[:, :horizon] * scaler_y.data_range_[0] + scaler_y.data_min_[0]
+            continue
+        rows = np.repeat(values[chunk][:, None, :], horizon, axis=1)
+        future_pos = chunk[:, None] + steps
+        for i, column in calendar_cols:
+            rows[:, :, i] = column[future_pos]
+        rows_scaled = rows * scaler_X.scale_ + scaler_X.min_
+        members = rollout(
+            forward, windows[chunk - window_size + 1], rows_scaled, tgt_idx, scaler_X, scaler_y,
+            n_members=member_count(model),
+        )
+        predictions[lo : lo + len(chunk)] = members.mean(axis=2)
+
+    actuals = values[origins[:, None] + steps, tgt_idx]
+    return BacktestResult(df.index[origins].to_numpy(), predictions, actuals)
@@ -0,0 +1,97 @@
+"""Forecast result cache keyed by model version, data watermark and assumptions.
+
+Shorter horizons are prefixes of longer ones, so each key stores a single
+forecast for the longest horizon ever requested and serves every shorter
+horizon as a slice.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+
+from trillium_watts.caching import LRUCache
+from trillium_watts.models.registry import hash_array
+
+
+def make_forecast_key(
+    model_version: str | None,
+    last_date,
+    exogenous: dict | None = None,
+    **options,
+) -> tuple:
+    """Build a hashable cache key.
+
+    Args:
+        model_version: Registry version (or any model identifier).
+        last_date: Last observed date of the history (the data watermark).
+        exogenous: Exogenous assumptions, e.g. ``{"T2M": +2.0}`` or per-day
+            arrays; arrays are hashed by content.
+        **options: Any other settings that change the result (e.g.
+            ``n_samples`` for probabilistic forecasts).
+    """
+    def freeze(value):
+        if isinstance(value, (np.ndarray, list, tuple)):
+            return hash_array(np.asarray(value, dtype=np.float64))
+        return value
+
+    exogenous = exogenous or {}
+    return (
+        model_version,
+        pd.Timestamp(last_date).isoformat(),
+        tuple(sorted((k, freeze(v)) for k, v in exogenous.items())),
+        tuple(sorted((k, freeze(v)) for k, v in options.items())),
+    )
+
+
+class ForecastCache:
+    """LRU cache of forecasts that serves shorter horizons as slices.
+
+    Args:
+        max_entries: Maximum number of cached keys.
+        min_horizon: Horizon computed on a miss at minimum — set it to the
+            longest horizon offered (e.g. ``max(config.prediction.horizons)``)
+            so the first request fills the cache for all of them.
+    """
+
+    def __init__(self, max_entries: int = 32, min_horizon: int = 30):
+        self.min_horizon = min_horizon
+        self._cache = LRUCache(max_entries)
+
+    def get(self, key: tuple, horizon: int) -> pd.Series | pd.DataFrame | None:
+        """Return the first ``horizon`` rows if cached, else None.
+
+        Only hits are counted; the miss is counted by the ``get_or_compute``
+        call that follows it.
+        """
+        if key not in self._cache:
+            return None
+        cached = self._cache.get(key)
+        if cached is None or len(cached) < horizon:
+            return None
+        return cached.iloc[:horizon]
+
+    def get_or_compute(
+        self,
+        key: tuple,
+        horizon: int,
+        compute: Callable[[int], pd.Series | pd.DataFrame],
+    ) -> pd.Series | pd.DataFrame:
+        """Return the first ``horizon`` rows of the forecast for ``key``.
+
+        ``compute(n)`` must return an ``n``-step forecast; it is only called
+        when nothing long enough is cached.
+        """
+        cached = self._cache.get(key)
+        if cached is None or len(cached) < horizon:
+            cached = compute(max(horizon, self.min_horizon))
+            self._cache.put(key, cached)
+        return cached.iloc[:horizon]
+
+    def stats(self) -> dict[str, int]:
+        return self._cache.stats()
+
+    def clear(self) -> None:
+        self._cache.clear()
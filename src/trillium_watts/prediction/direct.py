@@ -0,0 +1,44 @@
+"""Direct multi-horizon forecasting — all steps from one forward pass."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from trillium_watts.models.scaling import ArrayMinMaxScaler
+from trillium_watts.prediction.autoregressive import make_forward_fn
+
+
+def predict_direct(
+    model,
+    initial_sequence_scaled: np.ndarray,
+    num_steps: int,
+    scaler_y: ArrayMinMaxScaler,
+    features_df: pd.DataFrame,
+) -> pd.Series:
+    """Predict ``num_steps`` days with a direct multi-output model.
+
+    The model (built with ``output_steps >= num_steps``) emits every horizon
+    in a single forward pass, so latency does not grow with the horizon and
+    no prediction is fed back as input.
+
+    Args:
+        model: Trained Keras model or ``NumpyModel`` with a multi-step head.
+        initial_sequence_scaled: Shape (1, window_size, n_features), already scaled.
+        num_steps: Number of future days to return.
+        scaler_y: Target scaler the model was trained with.
+        features_df: DataFrame with historical data (used for the last date).
+
+    Returns:
+        pd.Series indexed by future dates with unscaled predicted values.
+    """
+    outputs = make_forward_fn(model)(initial_sequence_scaled)[0]
+    if num_steps > len(outputs):
+        raise ValueError(f"Model predicts {len(outputs)} steps, {num_steps} requested.")
+    future_scaled = outputs[:num_steps]
+    future_unscaled = future_scaled * scaler_y.data_range_[0] + scaler_y.data_min_[0]
+    last_date = features_df.index[-1]
+    future_dates = pd.date_range(last_date + timedelta(days=1), periods=num_steps, freq="D")
+    return pd.Series(future_unscaled, index=future_dates)
@@ -7,22 +7,20 @@ from pathlib import Path
 import pandas as pd
 
 
-def export_predictions_csv(
+def combine_predictions(
     historical_df: pd.DataFrame,
     predictions: pd.Series,
-    output_path: str | Path,
     target_column: str = "ACTIVA",
     label_historical: str = "Historica",
     label_predicted: str = "Predicha",
-) -> Path:
-    """Create a unified CSV with columns [Fecha, ACTIVA, Tipo].
+    bands: pd.DataFrame | None = None,
+) -> pd.DataFrame:
+    """Stack history and predictions into the [Fecha, ACTIVA, Tipo] layout.
 
-    Combines historical data and model predictions into a single file
-    that the Streamlit app consumes.
+    If ``bands`` (quantile columns such as P10/P50/P90 indexed like
+    ``predictions``) is given, those columns are added for the predicted
+    rows and left empty for the historical ones.
     """
-    output_path = Path(output_path)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
     # Historical portion
     df_hist = pd.DataFrame(
         {
@@ -40,8 +38,31 @@ def export_predictions_csv(
             "Tipo": label_predicted,
         }
     )
+    if bands is not None:
+        for column in bands.columns.drop("mean", errors="ignore"):
+            df_pred[column] = bands[column].reindex(predictions.index).values
 
     df_combined = pd.concat([df_hist, df_pred], ignore_index=True)
-    df_combined = df_combined.sort_values("Fecha").reset_index(drop=True)
-    df_combined.to_csv(output_path, index=False)
+    return df_combined.sort_values("Fecha").reset_index(drop=True)
+
+
+def export_predictions_csv(
+    historical_df: pd.DataFrame,
+    predictions: pd.Series,
+    output_path: str | Path,
+    target_column: str = "ACTIVA",
+    label_historical: str = "Historica",
+    label_predicted: str = "Predicha",
+    bands: pd.DataFrame | None = None,
+) -> Path:
+    """Create a unified CSV with columns [Fecha, ACTIVA, Tipo].
+
+    Combines historical data and model predictions into a single file
+    that the Streamlit app consumes (see ``combine_predictions``).
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    combine_predictions(
+        historical_df, predictions, target_column, label_historical, label_predicted, bands
+    ).to_csv(output_path, index=False)
     return output_path
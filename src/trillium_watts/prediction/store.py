@@ -0,0 +1,223 @@
+"""Append-only, partitioned forecast store.
+
+Layout under ``root``::
+
+    actuals/part-YYYYMMDD-YYYYMMDD.parquet        # observed target, each date stored once
+    forecasts/run_date=YYYY-MM-DD/model_version=vNNNN/run-<UTC timestamp>.parquet
+    csv_views.json                                 # byte offsets of the CSV views
+
+Every forecast run adds one small Parquet file (forecast dates, point
+forecast, optional quantile bands, ``run_at`` and ``as_of``) under a
+Hive-style partition, and only actuals newer than the last stored date are
+appended. Nothing already written is rewritten, so exporting a run costs
+time proportional to the new rows, not to the history. ``write_csv_view``
+keeps the legacy ``[Fecha, ACTIVA, Tipo, P..]`` CSV up to date the same way:
+it truncates the previous forecast rows and appends.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+_DATE_FMT = "%Y%m%d"
+
+
+class ForecastStore:
+    """Partitioned Parquet store of actuals and forecast runs.
+
+    Args:
+        root: Store directory (created on first write).
+        target_column: Name of the forecast target column.
+    """
+
+    def __init__(self, root: str | Path, target_column: str = "ACTIVA"):
+        self.root = Path(root)
+        self.target_column = target_column
+
+    @property
+    def actuals_dir(self) -> Path:
+        return self.root / "actuals"
+
+    @property
+    def forecasts_dir(self) -> Path:
+        return self.root / "forecasts"
+
+    # --- actuals -----------------------------------------------------------
+
+    def _actual_parts(self) -> list[Path]:
+        return sorted(self.actuals_dir.glob("part-*.parquet"))
+
+    def last_actual_date(self) -> pd.Timestamp | None:
+        """Last stored observation date, read from part file names only."""
+        parts = self._actual_parts()
+        if not parts:
+            return None
+        return pd.to_datetime(parts[-1].stem.split("-")[-1], format=_DATE_FMT)
+
+    def append_actuals(self, actuals: pd.Series) -> int:
+        """Store observations newer than ``last_actual_date``; return rows written.
+
+        Earlier dates are assumed unchanged and skipped.
+        """
+        last = self.last_actual_date()
+        new = actuals.sort_index()
+        if last is not None:
+            new = new[new.index > last]
+        if new.empty:
+            return 0
+        self.actuals_dir.mkdir(parents=True, exist_ok=True)
+        name = f"part-{new.index[0]:{_DATE_FMT}}-{new.index[-1]:{_DATE_FMT}}.parquet"
+        frame = pd.DataFrame({"Fecha": new.index, self.target_column: new.values})
+        _write_parquet(frame, self.actuals_dir / name)
+        return len(new)
+
+    def read_actuals(self, since=None) -> pd.Series:
+        """Stored observations, optionally only those after ``since``.
+
+        With ``since`` only part files that reach past it are opened.
+        """
+        parts = self._actual_parts()
+        if since is not None:
+            since = pd.Timestamp(since)
+            parts = [p for p in parts if pd.to_datetime(p.stem.split("-")[-1], format=_DATE_FMT) > since]
+        if not parts:
+            return pd.Series(dtype=float, name=self.target_column, index=pd.DatetimeIndex([], name="Fecha"))
+        actuals = pd.concat([pd.read_parquet(p) for p in parts], ignore_index=True).set_index("Fecha")[self.target_column]
+        return actuals[actuals.index > since] if since is not None else actuals
+
+    # --- forecasts ---------------------------------------------------------
+
+    def append_forecast(
+        self,
+        predictions: pd.Series,
+        model_version: str,
+        bands: pd.DataFrame | None = None,
+        as_of=None,
+        run_at: datetime | None = None,
+    ) -> Path:
+        """Write one forecast run as a new partition file and return its path.
+
+        Args:
+            predictions: Point forecast indexed by date.
+            model_version: Registry version that produced the forecast.
+            bands: Optional quantile columns (e.g. P10/P50/P90) indexed like
+                ``predictions``; a ``mean`` column is ignored.
+            as_of: Last observed date the forecast was conditioned on
+                (default: the day before the first forecast date).
+            run_at: Run timestamp (default: now, UTC).
+        """
+        run_at = pd.Timestamp(run_at or datetime.now(timezone.utc))
+        if run_at.tzinfo is None:
+            run_at = run_at.tz_localize("UTC")
+        as_of = pd.Timestamp(as_of) if as_of is not None else predictions.index[0] - pd.Timedelta(days=1)
+
+        frame = pd.DataFrame({"Fecha": predictions.index, self.target_column: predictions.values})
+        if bands is not None:
+            for column in bands.columns.drop("mean", errors="ignore"):
+                frame[column] = bands[column].reindex(predictions.index).values
+        frame["as_of"] = as_of
+        frame["run_at"] = run_at
+
+        partition = self.forecasts_dir / f"run_date={run_at:%Y-%m-%d}" / f"model_version={model_version}"
+        partition.mkdir(parents=True, exist_ok=True)
+        path = partition / f"run-{run_at:%Y%m%dT%H%M%S%f}.parquet"
+        _write_parquet(frame, path)
+        return path
+
+    def _run_files(self) -> list[Path]:
+        return sorted(self.forecasts_dir.glob("run_date=*/model_version=*/run-*.parquet"), key=lambda p: p.name)
+
+    def latest_forecast(self) -> pd.DataFrame | None:
+        """The most recent run (by ``run_at``), or None if the store is empty."""
+        runs = self._run_files()
+        return self._read_run(runs[-1]) if runs else None
+
+    def read_forecasts(self, model_version: str | None = None, run_date: str | None = None) -> pd.DataFrame:
+        """All stored runs, optionally filtered by partition keys."""
+        runs = [
+            p for p in self._run_files()
+            if (model_version is None or p.parent.name == f"model_version={model_version}")
+            and (run_date is None or p.parent.parent.name == f"run_date={pd.Timestamp(run_date):%Y-%m-%d}")
+        ]
+        if not runs:
+            return pd.DataFrame()
+        return pd.concat([self._read_run(p) for p in runs], ignore_index=True)
+
+    @staticmethod
+    def _read_run(path: Path) -> pd.DataFrame:
+        frame = pd.read_parquet(path)
+        frame["model_version"] = path.parent.name.split("=", 1)[1]
+        frame["run_date"] = path.parent.parent.name.split("=", 1)[1]
+        return frame
+
+    # --- legacy CSV view ---------------------------------------------------
+
+    def write_csv_view(
+        self,
+        output_path: str | Path,
+        label_historical: str = "Historica",
+        label_predicted: str = "Predicha",
+    ) -> Path:
+        """Write the ``[Fecha, ACTIVA, Tipo, P..]`` CSV consumed by the app.
+
+        Historical rows are followed by the latest forecast run. When the file
+        is the one this store last wrote, only actuals appended since then and
+        the new forecast rows are written; otherwise it is rebuilt.
+        """
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        forecast = self.latest_forecast()
+        bands = [] if forecast is None else [c for c in forecast.columns if c.startswith("P") and c[1:].isdigit()]
+        header = ["Fecha", self.target_column, "Tipo", *bands]
+
+        views_path = self.root / "csv_views.json"
+        views = json.loads(views_path.read_text()) if views_path.exists() else {}
+        key = str(output_path.resolve())
+        state = views.get(key)
+        if (
+            state is not None
+            and state["header"] == header
+            and output_path.exists()
+            and output_path.stat().st_size == state["size"]
+        ):
+            since = pd.Timestamp(state["last_actual"]) if state["last_actual"] else None
+            mode, offset = "r+b", state["history_bytes"]
+        else:
+            since, mode, offset = None, "wb", 0
+
+        actuals = self.read_actuals(since)
+        history = pd.DataFrame({"Fecha": actuals.index, self.target_column: actuals.values, "Tipo": label_historical})
+
+        with open(output_path, mode) as fh:
+            fh.seek(offset)
+            fh.truncate()
+            if mode == "wb":
+                fh.write((",".join(header) + "\n").encode())
+            fh.write(history.reindex(columns=header).to_csv(index=False, header=False, date_format="%Y-%m-%d").encode())
+            history_bytes = fh.tell()
+            if forecast is not None:
+                predicted = forecast.assign(Tipo=label_predicted).reindex(columns=header)
+                fh.write(predicted.to_csv(index=False, header=False, date_format="%Y-%m-%d").encode())
+            size = fh.tell()
+
+        last_actual = self.last_actual_date()
+        views[key] = {
+            "header": header,
+            "history_bytes": history_bytes,
+            "size": size,
+            "last_actual": last_actual.isoformat() if last_actual is not None else None,
+        }
+        self.root.mkdir(parents=True, exist_ok=True)
+        views_path.write_text(json.dumps(views, indent=2))
+        return output_path
+
+
+def _write_parquet(frame: pd.DataFrame, path: Path) -> None:
+    """Write via a temporary name so readers never see a partial file."""
+    tmp = path.with_suffix(".tmp")
+    frame.to_parquet(tmp, index=False)
+    tmp.replace(path)
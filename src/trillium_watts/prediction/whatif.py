@@ -0,0 +1,115 @@
+"""Batched what-if forecasts under exogenous scenarios.
+
+Each scenario overrides the future trajectory of one or more exogenous
+features (``T2M``, ``ALLSKY_SFC_SW_DWN``, ``REACTIVA``, ...). All scenarios
+become rows of a single rollout batch, so dozens of what-ifs cost roughly one
+forecast's worth of forward passes.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from trillium_watts.features.pipeline import build_calendar_features
+from trillium_watts.models.numpy_runtime import member_count
+from trillium_watts.models.scaling import ArrayMinMaxScaler
+from trillium_watts.prediction.autoregressive import build_future_rows, make_forward_fn, rollout
+
+WHATIF_MODES = ("absolute", "delta")
+
+
+def _scenario_matrix(values, num_steps: int, feature: str) -> np.ndarray:
+    """Coerce an override to shape (n_scenarios, 1) or (n_scenarios, num_steps)."""
+    arr = np.asarray(values, dtype=np.float64)
+    if arr.ndim == 1:
+        arr = arr[:, None]
+    if arr.ndim != 2 or arr.shape[1] not in (1, num_steps):
+        raise ValueError(
+            f"Override for '{feature}' must have shape (n_scenarios,) or "
+            f"(n_scenarios, {num_steps}), got {np.shape(values)}."
+        )
+    return arr
+
+
+def predict_whatif(
+    model,
+    initial_sequence_scaled: np.ndarray,
+    num_steps: int,
+    scaler_X: ArrayMinMaxScaler,
+    features_df: pd.DataFrame,
+    exogenous: dict[str, np.ndarray],
+    target_name: str = "ACTIVA",
+    features_list: list[str] | None = None,
+    scaler_y: ArrayMinMaxScaler | None = None,
+    scenario_names: list[str] | None = None,
+    mode: str = "absolute",
+) -> pd.DataFrame:
+    """Autoregressive forecasts for a set of exogenous scenarios in one batch.
+
+    Features without an override are carried forward from the last observed
+    row and calendar features follow the forecast dates, exactly as in
+    ``predict_future``.
+
+    Args:
+        model: Trained Keras model or ``NumpyModel``.
+        initial_sequence_scaled: Shape (1, window_size, n_features), already scaled.
+        num_steps: Number of future days to predict.
+        scaler_X: Fitted feature scaler.
+        features_df: Historical data (used for the last date).
+        exogenous: Feature name -> scenario matrix of shape
+            (n_scenarios, num_steps), or (n_scenarios,) for a constant value
+            per scenario. All matrices must share ``n_scenarios``.
+        target_name: Name of the target column.
+        features_list: Ordered list of feature column names.
+        scaler_y: Fitted target scaler; if None, ``scaler_X``'s target column is used.
+        scenario_names: Row labels (default ``0..n_scenarios-1``).
+        mode: ``"absolute"`` replaces the feature's trajectory with the given
+            values; ``"delta"`` adds them to the carried-forward value
+            (e.g. ``{"T2M": [0, 1, 2]}`` for +0/+1/+2 °C).
+
+    Returns:
+        DataFrame of unscaled demand, one row per scenario and one column
+        per forecast date.
+    """
+    if features_list is None:
+        raise ValueError("features_list must be provided.")
+    if mode not in WHATIF_MODES:
+        raise ValueError(f"mode must be one of {WHATIF_MODES}, got '{mode}'")
+    if not exogenous:
+        raise ValueError("exogenous must override at least one feature.")
+
+    future_dates = pd.date_range(features_df.index[-1] + timedelta(days=1), periods=num_steps, freq="D")
+    calendar = build_calendar_features(future_dates)
+    overrides = {}
+    for feature, values in exogenous.items():
+        if feature not in features_list:
+            raise ValueError(f"Unknown feature '{feature}'")
+        if feature == target_name or feature in calendar:
+            raise ValueError(f"'{feature}' is not an exogenous feature and cannot be overridden.")
+        overrides[features_list.index(feature)] = _scenario_matrix(values, num_steps, feature)
+
+    sizes = {arr.shape[0] for arr in overrides.values()}
+    if len(sizes) != 1:
+        raise ValueError(f"All scenario matrices must have the same number of rows, got {sorted(sizes)}.")
+    n_scenarios = sizes.pop()
+    if scenario_names is not None and len(scenario_names) != n_scenarios:
+        raise ValueError(f"Expected {n_scenarios} scenario names, got {len(scenario_names)}.")
+
+    last_unscaled = scaler_X.inverse_transform(initial_sequence_scaled[0, -1:])[0]
+    base_rows = build_future_rows(last_unscaled, future_dates, features_list, scaler_X)
+    rows = np.repeat(base_rows[None], n_scenarios, axis=0)
+    for i, values in overrides.items():
+        if mode == "delta":
+            values = last_unscaled[i] + values
+        rows[:, :, i] = values * scaler_X.scale_[i] + scaler_X.min_[i]
+
+    windows = np.repeat(initial_sequence_scaled[:1], n_scenarios, axis=0)
+    tgt_idx = features_list.index(target_name)
+    members = rollout(
+        make_forward_fn(model), windows, rows, tgt_idx, scaler_X, scaler_y, n_members=member_count(model)
+    )
+    index = pd.Index(scenario_names if scenario_names is not None else range(n_scenarios), name="scenario")
+    return pd.DataFrame(members.mean(axis=2), index=index, columns=future_dates)
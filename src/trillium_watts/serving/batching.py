@@ -0,0 +1,73 @@
+"""Request micro-batching — coalesce concurrent calls into one batched call."""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+
+
+class MicroBatcher:
+    """Collect requests from many threads and hand them to ``handler`` in batches.
+
+    A single worker thread waits for the first request, then keeps collecting
+    until ``max_batch`` requests are queued or ``max_wait_ms`` has elapsed,
+    and calls ``handler(requests) -> results`` once for the whole batch.
+
+    Args:
+        handler: Maps a list of requests to a list of results (same order).
+        max_batch: Maximum requests per handler call.
+        max_wait_ms: Longest time the first request of a batch waits for company.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[list], list],
+        max_batch: int = 64,
+        max_wait_ms: float = 5.0,
+    ):
+        self.handler = handler
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.batches = 0
+        self.requests = 0
+        self._queue: queue.Queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, request) -> Future:
+        """Queue ``request``; the returned future resolves to its result."""
+        future: Future = Future()
+        self._queue.put((request, future))
+        return future
+
+    def __call__(self, request, timeout: float | None = None):
+        """Submit ``request`` and block until its result is ready."""
+        return self.submit(request).result(timeout)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            requests = [request for request, _ in batch]
+            try:
+                results = self.handler(requests)
+            except Exception as exc:  # propagate to every waiting caller
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+            self.batches += 1
+            self.requests += len(batch)
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
@@ -0,0 +1,74 @@
+"""Concurrent load generator reporting latency percentiles for the forecast API.
+
+Usage::
+
+    python -m trillium_watts.serving.loadgen --url http://127.0.0.1:8765 \
+        --concurrency 32 --requests 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+def _request(url: str, payload: dict | None) -> float:
+    data = json.dumps(payload).encode() if payload is not None else None
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    with urllib.request.urlopen(req) as response:
+        response.read()
+    return time.perf_counter() - start
+
+
+def run_load(
+    url: str,
+    concurrency: int = 16,
+    n_requests: int = 1000,
+    payloads: list[dict] | None = None,
+) -> dict[str, float]:
+    """Fire ``n_requests`` at ``url`` from ``concurrency`` threads.
+
+    ``payloads`` are POSTed round-robin (GET when omitted). Returns
+    throughput and p50/p95/p99/max latency in milliseconds.
+    """
+    payloads = payloads or [None]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(
+            pool.map(lambda i: _request(url, payloads[i % len(payloads)]), range(n_requests))
+        )
+    elapsed = time.perf_counter() - start
+    ms = np.array(latencies) * 1000
+    return {
+        "requests": n_requests,
+        "concurrency": concurrency,
+        "throughput_rps": n_requests / elapsed,
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "max_ms": float(ms.max()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument("--endpoint", default="/forecast", choices=["/forecast", "/simulate"])
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+
+    payloads = [{"horizon": h} for h in (7, 15, 30)]
+    stats = run_load(args.url + args.endpoint, args.concurrency, args.requests, payloads)
+    for name, value in stats.items():
+        print(f"{name:>15}: {value:,.2f}")
+
+
+if __name__ == "__main__":
+    main()
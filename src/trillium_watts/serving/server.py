@@ -0,0 +1,132 @@
+"""Localhost JSON API over ``ForecastService`` (standard library only).
+
+Endpoints:
+    GET  /health                    -> model version, data watermark, cache and batch stats
+    GET  /forecast?horizon=30       -> daily forecast
+    POST /forecast  {"horizon": 30}
+    POST /whatif    {"horizon": 30, "exogenous": {"T2M": [0, 1, 2]}, "mode": "delta"}
+    POST /simulate  {"horizon": 30, "h_radiation": 4.5, ...}
+    POST /uncertainty {"horizon": 30, "n_samples": 50000, "seed": 0, ...}
+"""
+
+from __future__ import annotations
+
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from trillium_watts.serving.service import ForecastService
+
+
+def _forecast_payload(version: str, as_of, series) -> dict:
+    return {
+        "model_version": version,
+        "as_of": str(as_of.date()),
+        "horizon": len(series),
+        "forecast": [
+            {"date": str(date.date()), "ACTIVA": float(value)} for date, value in series.items()
+        ],
+    }
+
+
+def make_handler(service: ForecastService) -> type[BaseHTTPRequestHandler]:
+    """Build a request handler class bound to ``service``."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):  # keep load tests quiet
+            pass
+
+        def _send(self, status: int, payload: dict) -> None:
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _body(self) -> dict:
+            length = int(self.headers.get("Content-Length") or 0)
+            return json.loads(self.rfile.read(length)) if length else {}
+
+        def _dispatch(self, path: str, params: dict) -> None:
+            try:
+                if path == "/health":
+                    self._send(200, {
+                        "status": "ok",
+                        "model_version": service.live_model.registry.current_version(),
+                        "as_of": str(service.as_of.date()),
+                        "cache": service.cache.stats(),
+                        "batches": service.batcher.batches,
+                        "requests": service.batcher.requests,
+                    })
+                elif path == "/forecast":
+                    horizon = params.get("horizon")
+                    version, series = service.forecast(int(horizon) if horizon else None)
+                    self._send(200, _forecast_payload(version, service.as_of, series))
+                elif path == "/whatif":
+                    version, table = service.whatif(
+                        params.get("exogenous") or {},
+                        int(params["horizon"]) if params.get("horizon") else None,
+                        mode=params.get("mode", "absolute"),
+                        scenario_names=params.get("scenarios"),
+                    )
+                    self._send(200, {
+                        "model_version": version,
+                        "as_of": str(service.as_of.date()),
+                        "dates": [str(date.date()) for date in table.columns],
+                        "scenarios": [
+                            {"name": str(name), "ACTIVA": row.tolist()} for name, row in table.iterrows()
+                        ],
+                    })
+                elif path == "/simulate":
+                    horizon = params.pop("horizon", None)
+                    version, summary = service.simulate(int(horizon) if horizon else None, **params)
+                    self._send(200, {
+                        "model_version": version,
+                        "as_of": str(service.as_of.date()),
+                        "scenarios": summary.to_dict(orient="records"),
+                    })
+                elif path == "/uncertainty":
+                    horizon = params.pop("horizon", None)
+                    version, table = service.simulate_uncertainty(int(horizon) if horizon else None, **params)
+                    self._send(200, {
+                        "model_version": version,
+                        "as_of": str(service.as_of.date()),
+                        "results": table.reset_index().to_dict(orient="records"),
+                    })
+                else:
+                    self._send(404, {"error": f"Unknown endpoint {path}"})
+            except (ValueError, TypeError) as exc:
+                self._send(400, {"error": str(exc)})
+            except Exception as exc:  # answer instead of dropping the connection
+                self._send(500, {"error": f"{type(exc).__name__}: {exc}"})
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            self._dispatch(url.path, params)
+
+        def do_POST(self):
+            try:
+                params = self._body()
+            except json.JSONDecodeError as exc:
+                self._send(400, {"error": f"Invalid JSON: {exc}"})
+                return
+            if not isinstance(params, dict):
+                self._send(400, {"error": "Request body must be a JSON object."})
+                return
+            self._dispatch(urlparse(self.path).path, params)
+
+    return Handler
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # the default backlog of 5 resets bursts of concurrent clients
+
+
+def create_server(service: ForecastService, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    """Create (but do not start) a threaded HTTP server for ``service``."""
+    return _Server((host, port), make_handler(service))
@@ -0,0 +1,220 @@
+"""Warm forecast service — model, scalers and history kept in memory.
+
+Concurrent forecast requests are coalesced by a ``MicroBatcher``: each batch
+triggers at most one rollout per distinct cache key (for the longest horizon
+requested), and every request is answered with a slice of it.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from trillium_watts.caching import LRUCache
+from trillium_watts.config import Config
+from trillium_watts.models.registry import LiveModel, ModelRegistry
+from trillium_watts.prediction.autoregressive import predict_future, prepare_initial_sequence
+from trillium_watts.prediction.cache import ForecastCache, make_forecast_key
+from trillium_watts.prediction.direct import predict_direct
+from trillium_watts.prediction.whatif import predict_whatif
+from trillium_watts.serving.batching import MicroBatcher
+from trillium_watts.simulation.montecarlo import simulate_monte_carlo
+from trillium_watts.simulation.scenarios import simulate_all_scenarios
+from trillium_watts.simulation.solar import irradiance_climatology
+
+
+class ForecastService:
+    """Long-lived forecasting and simulation backend.
+
+    Args:
+        config: Loaded project configuration.
+        live_model: Hot-reloading handle on the registry's current version.
+        history: Processed daily history containing the feature columns.
+        max_batch: Maximum requests coalesced into one inference call.
+        max_wait_ms: How long a request waits for others to join its batch.
+        cache_entries: Size bound of the forecast LRU cache.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        live_model: LiveModel,
+        history: pd.DataFrame,
+        max_batch: int = 64,
+        max_wait_ms: float = 5.0,
+        cache_entries: int = 32,
+    ):
+        self.config = config
+        self.live_model = live_model
+        self.history = history
+        self.features = config.features.feature_columns
+        self.target = config.features.target
+        self.max_horizon = max(config.prediction.horizons)
+        self.cache = ForecastCache(cache_entries, min_horizon=self.max_horizon)
+        self.whatif_cache = LRUCache(cache_entries)
+        self.batcher = MicroBatcher(self._handle_forecasts, max_batch, max_wait_ms)
+
+    @classmethod
+    def from_config(cls, config: Config, root: str | Path, **kwargs) -> ForecastService:
+        """Load the current registry version and processed history from disk."""
+        root = Path(root)
+        registry = ModelRegistry(root / config.model.model_save_path)
+        history = pd.read_csv(root / config.data.processed_data_path, index_col=0, parse_dates=True)
+        return cls(config, LiveModel(registry, runtime="auto"), history, **kwargs)
+
+    @property
+    def as_of(self) -> pd.Timestamp:
+        """Last observed date of the in-memory history."""
+        return self.history.index[-1]
+
+    def update_history(self, history: pd.DataFrame) -> None:
+        """Swap in newer processed history.
+
+        Cache keys include ``as_of``, so forecasts for the old watermark are
+        never served for the new one. Requests read ``self.history`` once, so
+        one already in flight finishes against the history it started with.
+        """
+        self.history = history
+
+    # --- forecasting -------------------------------------------------------
+
+    def forecast(self, horizon: int | None = None) -> tuple[str, pd.Series]:
+        """Return ``(model_version, forecast)`` for ``horizon`` days."""
+        return self._forecast(horizon, self.history)
+
+    def _forecast(self, horizon: int | None, history: pd.DataFrame) -> tuple[str, pd.Series]:
+        horizon = horizon or self.config.prediction.default_horizon
+        if not 1 <= horizon <= self.max_horizon:
+            raise ValueError(f"horizon must be between 1 and {self.max_horizon}")
+        # Cache hits are answered directly; only misses queue for a batched rollout
+        version = self.live_model.get()[0]
+        cached = self.cache.get(make_forecast_key(version, history.index[-1]), horizon)
+        if cached is not None:
+            return version, cached
+        return self.batcher({"horizon": horizon, "history": history})
+
+    def _handle_forecasts(self, requests: list[dict]) -> list[tuple[str, pd.Series]]:
+        # Each request carries the history snapshot it was made against; a
+        # batch straddling update_history() holds one rollout per watermark.
+        version, model, scaler_X, scaler_y = self.live_model.get()
+        longest, snapshots = {}, {}
+        for request in requests:
+            as_of = request["history"].index[-1]
+            snapshots.setdefault(as_of, request["history"])
+            longest[as_of] = max(longest.get(as_of, 0), request["horizon"])
+        series = {
+            as_of: self.cache.get_or_compute(
+                make_forecast_key(version, as_of), n,
+                lambda n, history=snapshots[as_of]: self._compute(model, scaler_X, scaler_y, version, history, n),
+            )
+            for as_of, n in longest.items()
+        }
+        return [
+            (version, series[request["history"].index[-1]].iloc[: request["horizon"]]) for request in requests
+        ]
+
+    def _compute(
+        self, model, scaler_X, scaler_y, version: str, history: pd.DataFrame, num_steps: int
+    ) -> pd.Series:
+        initial = prepare_initial_sequence(history, self.features, self.config.model.window_size, scaler_X)
+        metadata = self.live_model.registry.metadata(version)
+        if metadata.get("forecast_mode") == "direct":
+            return predict_direct(model, initial, num_steps, scaler_y, history)
+        return predict_future(
+            model, initial, num_steps, scaler_X, history,
+            target_name=self.target, features_list=self.features, scaler_y=scaler_y,
+        )
+
+    def whatif(
+        self,
+        exogenous: dict,
+        horizon: int | None = None,
+        mode: str = "absolute",
+        scenario_names: list[str] | None = None,
+    ) -> tuple[str, pd.DataFrame]:
+        """Return ``(model_version, scenario x day forecasts)``, see ``predict_whatif``."""
+        horizon = horizon or self.config.prediction.default_horizon
+        if not 1 <= horizon <= self.max_horizon:
+            raise ValueError(f"horizon must be between 1 and {self.max_horizon}")
+        version, model, scaler_X, scaler_y = self.live_model.get()
+        if self.live_model.registry.metadata(version).get("forecast_mode") == "direct":
+            raise ValueError("What-if scenarios need an autoregressive model.")
+
+        history = self.history
+        key = make_forecast_key(version, history.index[-1], exogenous, mode=mode, horizon=horizon)
+        result = self.whatif_cache.get(key)
+        if result is None:
+            initial = prepare_initial_sequence(history, self.features, self.config.model.window_size, scaler_X)
+            result = predict_whatif(
+                model, initial, horizon, scaler_X, history, exogenous,
+                target_name=self.target, features_list=self.features, scaler_y=scaler_y, mode=mode,
+            )
+            self.whatif_cache.put(key, result)
+        if scenario_names is not None:
+            if len(scenario_names) != len(result):
+                raise ValueError(f"Expected {len(result)} scenario names, got {len(scenario_names)}.")
+            result = result.set_axis(pd.Index(scenario_names, name="scenario"))
+        return version, result
+
+    # --- simulation --------------------------------------------------------
+
+    def simulate(self, horizon: int | None = None, **params) -> tuple[str, pd.DataFrame]:
+        """Run the solar scenario simulation against the current forecast.
+
+        ``params`` override the configured defaults: ``h_radiation``,
+        ``performance_ratio``, ``kwh_per_liter``, ``co2_per_liter``,
+        ``diesel_price_cop``, ``scenarios`` (name -> capacity kW) and the
+        storage settings ``battery_kwh``, ``battery_power_kw`` and
+        ``round_trip_efficiency``.
+        ``h_radiation`` may also be a per-day list or ``"climatology"`` (the
+        day-of-year mean of the history's ``ALLSKY_SFC_SW_DWN``).
+        """
+        history = self.history
+        version, demand = self._forecast(horizon, history)
+        solar, economic, storage = self.config.solar, self.config.economic, self.config.storage
+        h_radiation = params.get("h_radiation", solar.default_h_radiation)
+        if h_radiation == "climatology":
+            h_radiation = irradiance_climatology(history["ALLSKY_SFC_SW_DWN"], demand.index)
+        summary = simulate_all_scenarios(
+            scenarios=params.get("scenarios", solar.scenarios),
+            demand_array=np.asarray(demand.values),
+            num_days=len(demand),
+            h_radiation=h_radiation,
+            performance_ratio=params.get("performance_ratio", solar.default_performance_ratio),
+            kwh_per_liter=params.get("kwh_per_liter", economic.kwh_per_liter_diesel),
+            co2_per_liter=params.get("co2_per_liter", economic.co2_per_liter_diesel),
+            diesel_price_cop=params.get("diesel_price_cop", economic.diesel_price_cop),
+            battery_kwh=params.get("battery_kwh", storage.battery_kwh),
+            battery_power_kw=params.get("battery_power_kw", storage.battery_power_kw),
+            round_trip_efficiency=params.get("round_trip_efficiency", storage.round_trip_efficiency),
+        )
+        return version, summary
+
+    def simulate_uncertainty(self, horizon: int | None = None, **params) -> tuple[str, pd.DataFrame]:
+        """Monte Carlo outcome distribution for the scenarios on the current forecast.
+
+        Point assumptions default to the ``solar`` and ``economic`` config
+        and the spreads, sample count and quantiles to ``uncertainty``; any
+        of them (and ``seed``) can be overridden in ``params``. Returns
+        ``(model_version, simulate_monte_carlo result)``.
+        """
+        version, demand = self.forecast(horizon)
+        solar, economic = self.config.solar, self.config.economic
+        spreads = asdict(self.config.uncertainty)
+        spreads.update((k, params[k]) for k in spreads if k in params)
+        spreads["quantiles"] = tuple(spreads["quantiles"])
+        result = simulate_monte_carlo(
+            scenarios=params.get("scenarios", solar.scenarios),
+            demand_array=np.asarray(demand.values),
+            h_radiation=params.get("h_radiation", solar.default_h_radiation),
+            performance_ratio=params.get("performance_ratio", solar.default_performance_ratio),
+            kwh_per_liter=params.get("kwh_per_liter", economic.kwh_per_liter_diesel),
+            co2_per_liter=params.get("co2_per_liter", economic.co2_per_liter_diesel),
+            diesel_price_cop=params.get("diesel_price_cop", economic.diesel_price_cop),
+            seed=params.get("seed"),
+            **spreads,
+        )
+        return version, result
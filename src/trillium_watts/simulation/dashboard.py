@@ -0,0 +1,130 @@
+"""Scenario results for the dashboard, computed once per interaction.
+
+The metric cards, the comparison chart and the summary table are all views
+of one ``simulate_all_scenarios`` result, so they always show the same
+numbers (solar use capped by demand) and the scenarios are evaluated in a
+single vectorized call. Sensitivity heatmaps are one ``simulate_grid`` call
+over a two-parameter grid.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from trillium_watts.simulation.grid import GRID_PARAMETERS, simulate_grid
+from trillium_watts.simulation.memo import SimulationCache
+from trillium_watts.simulation.scenarios import simulate_all_scenarios
+
+CHART_COLUMNS = [
+    "Escenario",
+    "Generacion Solar Total (kWh)",
+    "Litros Diesel Ahorrados",
+    "Reduccion CO2 (kg)",
+    "Ahorro Economico (COP)",
+]
+
+# Parameter pairs offered as heatmap axes (x, y)
+SENSITIVITY_AXES = {
+    "h_pr": ("h_radiation", "performance_ratio"),
+    "capacity_price": ("capacity_kw", "diesel_price_cop"),
+}
+
+
+@dataclass(frozen=True)
+class ScenarioResults:
+    """Summary of all active scenarios (one row each, ``Escenario`` first)."""
+
+    summary: pd.DataFrame
+
+    @cached_property
+    def chart_data(self) -> pd.DataFrame:
+        """Columns plotted in the scenario comparison chart."""
+        return self.summary[CHART_COLUMNS]
+
+    @cached_property
+    def _metrics_by_scenario(self) -> dict[str, dict[str, float]]:
+        values = {column: self.summary[column].to_numpy() for column in CHART_COLUMNS[1:]}
+        return {
+            name: {column: float(v[i]) for column, v in values.items()}
+            for i, name in enumerate(self.summary["Escenario"])
+        }
+
+    def metrics(self, name: str) -> dict[str, float]:
+        """Chart columns of scenario ``name`` as a dict."""
+        if name not in self._metrics_by_scenario:
+            raise ValueError(f"Unknown scenario: '{name}'.")
+        return self._metrics_by_scenario[name]
+
+
+def compute_scenario_results(
+    scenarios: dict[str, int],
+    demand_array: np.ndarray,
+    h_radiation: float | np.ndarray,
+    performance_ratio: float,
+    kwh_per_liter: float,
+    co2_per_liter: float,
+    diesel_price_cop: float,
+    cache: SimulationCache | None = None,
+    **storage,
+) -> ScenarioResults:
+    """Evaluate every scenario once for the dashboard.
+
+    The horizon is the length of ``demand_array``. With a ``cache`` the
+    result is memoized and shared between callers, so it must be treated
+    as read-only. ``storage`` is passed on to ``simulate_all_scenarios``
+    (``battery_kwh``, ``battery_power_kw``, ``round_trip_efficiency``).
+    """
+    params = dict(
+        scenarios=scenarios,
+        demand_array=demand_array,
+        num_days=len(demand_array),
+        h_radiation=h_radiation,
+        performance_ratio=performance_ratio,
+        kwh_per_liter=kwh_per_liter,
+        co2_per_liter=co2_per_liter,
+        diesel_price_cop=diesel_price_cop,
+        **storage,
+    )
+
+    def compute() -> ScenarioResults:
+        return ScenarioResults(simulate_all_scenarios(**params))
+
+    if cache is None:
+        return compute()
+    return cache.get_or_compute("scenario_results", compute, **params)
+
+
+def compute_sensitivity_grid(
+    demand_array: np.ndarray,
+    x_values,
+    y_values,
+    axes: str = "h_pr",
+    cache: SimulationCache | None = None,
+    **fixed,
+) -> pd.DataFrame:
+    """Simulate every combination of ``x_values`` x ``y_values``.
+
+    ``axes`` picks the varied parameters from ``SENSITIVITY_AXES``; ``fixed``
+    must give every other ``GRID_PARAMETERS`` entry as a scalar. Returns the
+    tidy ``simulate_grid`` frame (memoized when ``cache`` is given).
+    """
+    if axes not in SENSITIVITY_AXES:
+        raise ValueError(f"Unknown axes '{axes}'. Available: {list(SENSITIVITY_AXES)}")
+    x_name, y_name = SENSITIVITY_AXES[axes]
+    missing = set(GRID_PARAMETERS) - {x_name, y_name} - set(fixed)
+    extra = (set(fixed) - set(GRID_PARAMETERS)) | (set(fixed) & {x_name, y_name})
+    if missing or extra:
+        raise ValueError(f"Fixed parameters missing: {sorted(missing)}, unexpected: {sorted(extra)}.")
+
+    params = dict(fixed, **{x_name: np.asarray(x_values), y_name: np.asarray(y_values)})
+
+    def compute() -> pd.DataFrame:
+        return simulate_grid(demand_array, **params)
+
+    if cache is None:
+        return compute()
+    return cache.get_or_compute("sensitivity_grid", compute, demand_array=demand_array, **params)
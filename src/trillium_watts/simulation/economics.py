@@ -6,15 +6,18 @@ import numpy as np
 
 
 def calculate_diesel_savings(
-    solar_energy_daily_kwh: float,
+    solar_energy_daily_kwh: float | np.ndarray,
     demand_kwh_array: np.ndarray,
     kwh_per_liter: float,
     co2_per_liter: float,
     diesel_price_cop: float,
-) -> dict[str, float]:
+) -> dict[str, float | np.ndarray]:
     """Calculate diesel savings, CO2 reduction, and economic savings.
 
-    Solar energy displaces diesel generation up to the daily demand.
+    Solar energy displaces diesel generation up to the daily demand, day by
+    day. ``solar_energy_daily_kwh`` may be a constant, a per-day array, or a
+    (n_scenarios, n_days) array; totals are taken over the last (day) axis,
+    so the 2-D case returns one total per scenario.
 
     Returns dict with keys:
         diesel_saved_liters, co2_avoided_kg, economic_savings_cop,
@@ -26,8 +29,13 @@ def calculate_diesel_savings(
     economic_savings = diesel_saved * diesel_price_cop
 
     return {
-        "diesel_saved_liters": float(diesel_saved.sum()),
-        "co2_avoided_kg": float(co2_avoided.sum()),
-        "economic_savings_cop": float(economic_savings.sum()),
-        "solar_energy_used_kwh": float(solar_used.sum()),
+        "diesel_saved_liters": _total(diesel_saved),
+        "co2_avoided_kg": _total(co2_avoided),
+        "economic_savings_cop": _total(economic_savings),
+        "solar_energy_used_kwh": _total(solar_used),
     }
+
+
+def _total(daily: np.ndarray) -> float | np.ndarray:
+    total = daily.sum(axis=-1)
+    return float(total) if np.ndim(total) == 0 else total
@@ -0,0 +1,82 @@
+"""Discounted cash-flow helpers (all functions broadcast over arrays)."""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def annuity_factor(discount_rate, years):
+    """Present value of 1 per year for ``years`` years, paid at year end."""
+    rate = np.asarray(discount_rate, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        factor = (1.0 - (1.0 + rate) ** -np.asarray(years, dtype=np.float64)) / rate
+    return np.where(rate == 0, years, factor)
+
+
+def net_present_value(capex, annual_net_cash_flow, discount_rate, years):
+    """NPV of an upfront investment followed by a constant yearly cash flow."""
+    return -np.asarray(capex) + np.asarray(annual_net_cash_flow) * annuity_factor(discount_rate, years)
+
+
+def levelized_cost(capex, annual_om, annual_energy_kwh, discount_rate, years):
+    """Levelized cost per kWh of useful energy (``inf`` when no energy is delivered)."""
+    factor = annuity_factor(discount_rate, years)
+    energy = np.asarray(annual_energy_kwh, dtype=np.float64) * factor
+    cost = np.asarray(capex) + np.asarray(annual_om) * factor
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(energy > 0, cost / energy, np.inf)
+
+
+def discount_cash_flows(cash_flows: np.ndarray, discount_rate) -> np.ndarray:
+    """Present value of yearly cash flows (last axis, year 0 first).
+
+    ``discount_rate`` broadcasts against the leading axes.
+    """
+    cash_flows = np.asarray(cash_flows, dtype=np.float64)
+    years = np.arange(cash_flows.shape[-1])
+    rate = np.asarray(discount_rate, dtype=np.float64)[..., None]
+    return (cash_flows / (1.0 + rate) ** years).sum(axis=-1)
+
+
+def internal_rate_of_return(
+    cash_flows: np.ndarray,
+    low: float = -0.99,
+    high: float = 10.0,
+    iterations: int = 60,
+) -> np.ndarray:
+    """IRR of yearly cash flows (last axis) by vectorized bisection.
+
+    Assumes NPV decreases with the rate (an investment followed by net
+    inflows); rows whose NPV does not change sign on ``[low, high]`` give NaN.
+    """
+    cash_flows = np.asarray(cash_flows, dtype=np.float64)
+    shape = cash_flows.shape[:-1]
+    lo, hi = np.full(shape, low), np.full(shape, high)
+    valid = (discount_cash_flows(cash_flows, lo) >= 0) & (discount_cash_flows(cash_flows, hi) <= 0)
+    for _ in range(iterations):
+        mid = (lo + hi) / 2
+        positive = discount_cash_flows(cash_flows, mid) > 0
+        lo = np.where(positive, mid, lo)
+        hi = np.where(positive, hi, mid)
+    return np.where(valid, (lo + hi) / 2, np.nan)
+
+
+def payback_period(cash_flows: np.ndarray, discount_rate=None) -> np.ndarray:
+    """Years until cumulative cash flow turns non-negative (NaN if never).
+
+    Interpolates linearly within the payback year. With ``discount_rate`` the
+    discounted payback period is returned.
+    """
+    cash_flows = np.asarray(cash_flows, dtype=np.float64)
+    if discount_rate is not None:
+        years = np.arange(cash_flows.shape[-1])
+        cash_flows = cash_flows / (1.0 + np.asarray(discount_rate, dtype=np.float64)[..., None]) ** years
+    cumulative = np.cumsum(cash_flows, axis=-1)
+    recovered = cumulative >= 0
+    recovered[..., 0] = False
+    year = np.argmax(recovered, axis=-1)
+    previous = np.take_along_axis(cumulative, np.maximum(year - 1, 0)[..., None], axis=-1)[..., 0]
+    inflow = np.take_along_axis(cash_flows, year[..., None], axis=-1)[..., 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        period = year - 1 + (-previous / inflow)
+    return np.where(recovered.any(axis=-1), period, np.nan)
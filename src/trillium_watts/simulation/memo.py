@@ -0,0 +1,76 @@
+"""Memoized simulation calls for interactive use.
+
+The dashboard re-runs the whole script on every widget change, usually with
+parameter sets that were already evaluated a few interactions earlier.
+``SimulationCache`` keys results by the function name and its normalized
+arguments — floats rounded so slider noise such as ``4.5000000001`` maps to
+``4.5``, demand slices hashed by content — and keeps them in a bounded,
+thread-safe LRU shared by every session.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+
+from trillium_watts.caching import LRUCache
+from trillium_watts.models.registry import hash_array
+from trillium_watts.simulation.scenarios import simulate_all_scenarios
+
+
+def _freeze(value, decimals: int):
+    """Hashable, normalized form of an argument value."""
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, (int, float, np.number)):
+        return round(float(value), decimals) + 0.0  # -0.0 -> 0.0
+    if isinstance(value, dict):
+        # Insertion order is kept: it sets the row order of the result
+        return tuple((k, _freeze(v, decimals)) for k, v in value.items())
+    if isinstance(value, (np.ndarray, pd.Series, list, tuple)):
+        return hash_array(np.asarray(value, dtype=np.float64))
+    raise TypeError(f"Cannot build a cache key from {type(value).__name__}.")
+
+
+class SimulationCache:
+    """LRU cache of simulation results keyed by normalized parameters.
+
+    Args:
+        max_entries: Maximum number of cached results.
+        decimals: Floats are rounded to this many decimals in the key.
+    """
+
+    def __init__(self, max_entries: int = 256, decimals: int = 6):
+        self.decimals = decimals
+        self._cache = LRUCache(max_entries)
+
+    def make_key(self, name: str, **params) -> tuple:
+        """Key for ``name`` called with ``params`` (order of keywords is irrelevant)."""
+        return (name, tuple(sorted((k, _freeze(v, self.decimals)) for k, v in params.items())))
+
+    def get_or_compute(self, name: str, compute: Callable[[], object], **params):
+        """Return the cached result for ``(name, params)``, calling ``compute()`` on a miss.
+
+        Cached objects are shared; callers must not modify them in place.
+        """
+        key = self.make_key(name, **params)
+        result = self._cache.get(key)
+        if result is None:
+            result = compute()
+            self._cache.put(key, result)
+        return result
+
+    def simulate_all_scenarios(self, **kwargs) -> pd.DataFrame:
+        """Memoized ``simulate_all_scenarios``; returns a copy the caller may modify."""
+        result = self.get_or_compute(
+            "simulate_all_scenarios", lambda: simulate_all_scenarios(**kwargs), **kwargs
+        )
+        return result.copy()
+
+    def stats(self) -> dict[str, int]:
+        return self._cache.stats()
+
+    def clear(self) -> None:
+        self._cache.clear()
@@ -6,7 +6,8 @@ import numpy as np
 import pandas as pd
 
 from trillium_watts.simulation.economics import calculate_diesel_savings
-from trillium_watts.simulation.solar import calculate_solar_energy
+from trillium_watts.simulation.solar import daily_solar_generation
+from trillium_watts.simulation.storage import dispatch_storage
 
 
 def get_active_scenarios(
@@ -21,33 +22,51 @@ def simulate_all_scenarios(
     scenarios: dict[str, int],
     demand_array: np.ndarray,
     num_days: int,
-    h_radiation: float,
+    h_radiation: float | np.ndarray,
     performance_ratio: float,
     kwh_per_liter: float,
     co2_per_liter: float,
     diesel_price_cop: float,
+    battery_kwh: float = 0.0,
+    battery_power_kw: float | None = None,
+    round_trip_efficiency: float = 0.9,
 ) -> pd.DataFrame:
-    """Run simulation for all active scenarios and return a summary DataFrame."""
-    rows = []
-    for name, capacity_kw in scenarios.items():
-        daily_solar = calculate_solar_energy(capacity_kw, h_radiation, performance_ratio)
-        savings = calculate_diesel_savings(
-            daily_solar, demand_array, kwh_per_liter, co2_per_liter, diesel_price_cop
-        )
-
-        total_demand = float(demand_array.sum())
-        satisfaction_pct = (savings["solar_energy_used_kwh"] / total_demand * 100) if total_demand > 0 else 0.0
-
-        rows.append(
-            {
-                "Escenario": name,
-                "Demanda Total Predicha (kWh)": total_demand,
-                "Generacion Solar Total (kWh)": daily_solar * num_days,
-                "Capacidad Satisfaccion Demanda (%)": satisfaction_pct,
-                "Litros Diesel Ahorrados": savings["diesel_saved_liters"],
-                "Ahorro Economico (COP)": savings["economic_savings_cop"],
-                "Reduccion CO2 (kg)": savings["co2_avoided_kg"],
-            }
-        )
-
-    return pd.DataFrame(rows)
+    """Run simulation for all active scenarios and return a summary DataFrame.
+
+    ``h_radiation`` is a constant or a per-day irradiance array aligned with
+    ``demand_array``; all scenarios are evaluated as one (scenario, day) array.
+    With ``battery_kwh > 0`` each scenario gets that battery (see
+    ``dispatch_storage``): stored surplus displaces extra diesel, and the
+    battery's share and equivalent full cycles are added as columns.
+    """
+    capacities = np.fromiter(scenarios.values(), dtype=np.float64, count=len(scenarios))
+    demand = np.asarray(demand_array, dtype=np.float64)
+    daily_solar = daily_solar_generation(capacities, h_radiation, performance_ratio)
+    savings = calculate_diesel_savings(daily_solar, demand, kwh_per_liter, co2_per_liter, diesel_price_cop)
+
+    total_demand = float(np.sum(demand))
+    used = np.broadcast_to(savings["solar_energy_used_kwh"], capacities.shape)
+    liters = np.broadcast_to(savings["diesel_saved_liters"], capacities.shape)
+    generation = np.broadcast_to(daily_solar, (len(capacities), num_days))
+
+    storage = None
+    if battery_kwh > 0:
+        storage = dispatch_storage(generation, demand, battery_kwh, battery_power_kw, round_trip_efficiency)
+        used = used + storage.discharged_kwh
+        liters = liters + storage.diesel_displaced_liters(kwh_per_liter)
+
+    summary = pd.DataFrame(
+        {
+            "Escenario": list(scenarios),
+            "Demanda Total Predicha (kWh)": total_demand,
+            "Generacion Solar Total (kWh)": generation.sum(axis=1),
+            "Capacidad Satisfaccion Demanda (%)": used / total_demand * 100 if total_demand > 0 else 0.0,
+            "Litros Diesel Ahorrados": liters,
+            "Ahorro Economico (COP)": liters * diesel_price_cop,
+            "Reduccion CO2 (kg)": liters * co2_per_liter,
+        }
+    )
+    if storage is not None:
+        summary["Diesel Adicional por Bateria (L)"] = storage.diesel_displaced_liters(kwh_per_liter)
+        summary["Ciclos Equivalentes Bateria"] = storage.equivalent_full_cycles
+    return summary
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import numpy as np
+import pandas as pd
+
 
 def calculate_solar_energy(
     capacity_kw: float,
@@ -12,6 +15,8 @@ def calculate_solar_energy(
 
     E = Pr * H * PR
 
+    Arguments broadcast, so ``h_radiation`` may be a per-day irradiance array.
+
     Args:
         capacity_kw: Nominal system power (kW).
         h_radiation: Mean daily solar radiation (kWh/m2/day).
@@ -21,3 +26,38 @@ def calculate_solar_energy(
         Daily energy generated in kWh.
     """
     return capacity_kw * h_radiation * performance_ratio
+
+
+def daily_solar_generation(
+    capacities_kw,
+    h_radiation,
+    performance_ratio: float,
+) -> np.ndarray:
+    """Daily generation for several systems, shape (n_scenarios, n_days).
+
+    Args:
+        capacities_kw: Nominal power of each scenario (kW).
+        h_radiation: Constant radiation or a per-day irradiance array
+            (kWh/m2/day), e.g. historical or climatological
+            ``ALLSKY_SFC_SW_DWN``. A constant gives ``n_days == 1``, which
+            broadcasts against any demand array.
+        performance_ratio: System performance ratio.
+    """
+    capacities = np.asarray(capacities_kw, dtype=np.float64).reshape(-1, 1)
+    radiation = np.atleast_1d(np.asarray(h_radiation, dtype=np.float64))
+    if radiation.ndim != 1:
+        raise ValueError("h_radiation must be a scalar or 1-D per-day array.")
+    return calculate_solar_energy(capacities, radiation[None, :], performance_ratio)
+
+
+def irradiance_climatology(irradiance: pd.Series, dates: pd.DatetimeIndex) -> np.ndarray:
+    """Day-of-year mean irradiance from a historical daily series, for ``dates``.
+
+    Days of year missing from the history (e.g. 366) are filled by circular
+    interpolation between their neighbours.
+    """
+    means = irradiance.groupby(irradiance.index.dayofyear).mean()
+    days = np.arange(1, 367)
+    known = means.index.to_numpy()
+    profile = np.interp(days, known, means.to_numpy(), period=366)
+    return profile[pd.DatetimeIndex(dates).dayofyear - 1]
@@ -0,0 +1,106 @@
+"""Constant-memory estimators for chunked simulations.
+
+``RunningMoments`` merges per-chunk means and variances (Chan et al.) for a
+batch of independent streams. ``StreamingHistogram`` keeps a fixed number of
+equal-width bins and doubles the bin width (merging neighbouring bins)
+whenever new values fall outside its range, so quantiles of an unbounded
+stream are estimated to within one bin width without storing any draws.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+class RunningMoments:
+    """Count, mean and variance of several streams updated chunk by chunk.
+
+    Args:
+        n_streams: Number of independent streams (rows of each update).
+    """
+
+    def __init__(self, n_streams: int):
+        self.count = 0
+        self.mean = np.zeros(n_streams)
+        self._m2 = np.zeros(n_streams)
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a chunk of shape (n_streams, chunk_size)."""
+        n = values.shape[1]
+        if n == 0:
+            return
+        chunk_mean = values.mean(axis=1)
+        chunk_m2 = ((values - chunk_mean[:, None]) ** 2).sum(axis=1)
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean = self.mean + delta * (n / total)
+        self._m2 = self._m2 + chunk_m2 + delta**2 * (self.count * n / total)
+        self.count = total
+
+    @property
+    def std(self) -> np.ndarray:
+        """Sample standard deviation (ddof=1)."""
+        if self.count < 2:
+            return np.zeros_like(self.mean)
+        return np.sqrt(self._m2 / (self.count - 1))
+
+
+class StreamingHistogram:
+    """Fixed-size, self-rescaling histogram for streaming quantiles.
+
+    Args:
+        n_bins: Number of bins (even); resolution is ``range / n_bins``.
+    """
+
+    def __init__(self, n_bins: int = 4096):
+        if n_bins < 2 or n_bins % 2:
+            raise ValueError("n_bins must be an even number >= 2.")
+        self.n_bins = n_bins
+        self.counts = np.zeros(n_bins, dtype=np.int64)
+        self.lo = None
+        self.width = None
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+    def _merge_pairs(self) -> np.ndarray:
+        self.width *= 2
+        return self.counts.reshape(-1, 2).sum(axis=1)
+
+    def update(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if values.size == 0:
+            return
+        vmin, vmax = float(values.min()), float(values.max())
+        self.min, self.max = min(self.min, vmin), max(self.max, vmax)
+
+        if self.lo is None:
+            self.lo = vmin
+            self.width = (vmax - vmin) / self.n_bins or max(abs(vmin), 1.0) * 1e-9
+        half = self.n_bins // 2
+        while vmax > self.lo + self.width * self.n_bins:  # grow upwards, keep lo
+            merged = self._merge_pairs()
+            self.counts = np.concatenate([merged, np.zeros(half, dtype=np.int64)])
+        while vmin < self.lo:  # grow downwards, keep hi
+            hi = self.lo + self.width * self.n_bins
+            merged = self._merge_pairs()
+            self.counts = np.concatenate([np.zeros(half, dtype=np.int64), merged])
+            self.lo = hi - self.width * self.n_bins
+
+        idx = np.minimum(((values - self.lo) / self.width).astype(np.int64), self.n_bins - 1)
+        self.counts += np.bincount(idx, minlength=self.n_bins)
+
+    def quantile(self, q) -> np.ndarray:
+        """Estimate quantile(s) ``q`` by linear interpolation within bins."""
+        q = np.asarray(q, dtype=np.float64)
+        if self.lo is None:
+            return np.full(q.shape, np.nan)
+        cdf = np.cumsum(self.counts)
+        target = q * cdf[-1]
+        i = np.minimum(np.searchsorted(cdf, target, side="left"), self.n_bins - 1)
+        before = np.where(i > 0, cdf[i - 1], 0)
+        frac = np.where(self.counts[i] > 0, (target - before) / np.maximum(self.counts[i], 1), 0.0)
+        return np.clip(self.lo + (i + frac) * self.width, self.min, self.max)
@@ -0,0 +1,85 @@
+"""Shape-preserving downsampling of long time series for plotting.
+
+Both functions return sorted indices into the input, always including the
+first and last point, so the same selection can be applied to any aligned
+column (dates, bands, hover data).
+
+- ``lttb_indices``: Largest-Triangle-Three-Buckets (Steinarsson, 2013), which
+  keeps the points that contribute most to the visual shape of a line.
+- ``minmax_indices``: the minimum and maximum of each bucket, fully
+  vectorized; every peak and trough survives.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+DOWNSAMPLING_METHODS = ("lttb", "minmax")
+
+
+def _as_float(values) -> np.ndarray:
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        values = values.astype("datetime64[ns]").astype(np.int64)
+    return values.astype(np.float64)
+
+
+def lttb_indices(x, y, n_out: int) -> np.ndarray:
+    """Indices of ``n_out`` points chosen by Largest-Triangle-Three-Buckets."""
+    x, y = _as_float(x), _as_float(y)
+    n = len(y)
+    if n <= n_out:
+        return np.arange(n)
+    if n_out < 3:
+        raise ValueError("n_out must be >= 3.")
+
+    # n_out - 2 buckets over the interior points; edges[i]:edges[i+1] is bucket i
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    x_sum = np.concatenate([[0.0], np.cumsum(x)])
+    y_sum = np.concatenate([[0.0], np.cumsum(y)])
+    # Average of the following bucket (the last point for the last bucket)
+    nxt_lo, nxt_hi = edges[1:], np.append(edges[2:], n)
+    avg_x = (x_sum[nxt_hi] - x_sum[nxt_lo]) / (nxt_hi - nxt_lo)
+    avg_y = (y_sum[nxt_hi] - y_sum[nxt_lo]) / (nxt_hi - nxt_lo)
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs(
+            (x[a] - avg_x[i]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y[i] - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(y, n_out: int) -> np.ndarray:
+    """Indices of the min and max of ``n_out // 2`` equal buckets (at most ``n_out`` points)."""
+    y = _as_float(y)
+    n = len(y)
+    if n <= n_out:
+        return np.arange(n)
+    if n_out < 4:
+        raise ValueError("n_out must be >= 4.")
+
+    # Equal-size buckets over the interior points, NaN-padded at the end
+    interior = y[1:-1]
+    size = -(-len(interior) // ((n_out - 2) // 2))
+    n_buckets = -(-len(interior) // size)
+    padded = np.full(n_buckets * size, np.nan)
+    padded[: len(interior)] = interior
+    padded = padded.reshape(n_buckets, size)
+    offsets = np.arange(n_buckets) * size + 1
+    picks = np.concatenate([[0, n - 1], offsets + np.nanargmin(padded, axis=1), offsets + np.nanargmax(padded, axis=1)])
+    return np.unique(picks)
+
+
+def downsample_indices(x, y, n_out: int, method: str = "lttb") -> np.ndarray:
+    """Dispatch to ``lttb_indices`` or ``minmax_indices``."""
+    if method == "lttb":
+        return lttb_indices(x, y, n_out)
+    if method == "minmax":
+        return minmax_indices(y, n_out)
+    raise ValueError(f"Unknown method '{method}'. Available: {DOWNSAMPLING_METHODS}")
@@ -6,16 +6,42 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 
+from trillium_watts.visualization.downsampling import downsample_indices
+
+
+def _hex_to_rgba(color: str, alpha: float) -> str:
+    color = color.lstrip("#")
+    r, g, b = (int(color[i : i + 2], 16) for i in (0, 2, 4))
+    return f"rgba({r}, {g}, {b}, {alpha})"
+
 
 def create_demand_time_series_figure(
     df: pd.DataFrame,
     color_historical: str = "#1d7a8d",
     color_predicted: str = "#ff6f00",
+    band_columns: tuple[str, str] = ("P10", "P90"),
+    max_points: int | None = None,
+    x_range: tuple | None = None,
+    method: str = "lttb",
 ) -> go.Figure:
     """Create the historical + predicted demand line chart.
 
-    Expects a DataFrame with columns: Fecha, ACTIVA, Tipo.
+    Expects a DataFrame with columns: Fecha, ACTIVA, Tipo. If the quantile
+    columns in ``band_columns`` are present, the predicted range is drawn
+    as a shaded band around the forecast.
+
+    With ``max_points`` the lines are WebGL traces restricted to
+    ``x_range`` (start, end) and downsampled (``method``: "lttb" or
+    "minmax") to at most ``max_points`` points in total, so the payload is
+    bounded whatever the history length. Series that fit in a quarter of
+    the budget (the forecast) are never downsampled. Full resolution is drawn once the
+    visible range holds fewer points than that.
     """
+    if max_points is not None:
+        return _create_downsampled_demand_figure(
+            df, color_historical, color_predicted, band_columns, max_points, x_range, method
+        )
+
     fig = px.line(
         df,
         x="Fecha",
@@ -33,6 +59,29 @@ def create_demand_time_series_figure(
         title="Serie Temporal de Demanda Energetica",
     )
     fig.update_traces(mode="lines+markers")
+
+    lower_col, upper_col = band_columns
+    if lower_col in df.columns and upper_col in df.columns:
+        band = df.dropna(subset=[lower_col, upper_col])
+        fig.add_trace(
+            go.Scatter(
+                x=band["Fecha"], y=band[upper_col],
+                mode="lines", line=dict(width=0), showlegend=False, hoverinfo="skip",
+            )
+        )
+        fig.add_trace(
+            go.Scatter(
+                x=band["Fecha"], y=band[lower_col],
+                mode="lines", line=dict(width=0), fill="tonexty",
+                fillcolor=_hex_to_rgba(color_predicted, 0.2),
+                name=f"Intervalo {lower_col}-{upper_col}",
+            )
+        )
+    _apply_demand_layout(fig)
+    return fig
+
+
+def _apply_demand_layout(fig: go.Figure) -> None:
     fig.update_layout(
         template="plotly_white",
         title_font=dict(size=20, family="Arial", color="#333"),
@@ -41,6 +90,74 @@ def create_demand_time_series_figure(
         legend=dict(title="", orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
         margin=dict(l=30, r=30, t=50, b=30),
     )
+
+
+def _create_downsampled_demand_figure(
+    df: pd.DataFrame,
+    color_historical: str,
+    color_predicted: str,
+    band_columns: tuple[str, str],
+    max_points: int,
+    x_range: tuple | None,
+    method: str,
+) -> go.Figure:
+    """WebGL version of ``create_demand_time_series_figure`` (see there)."""
+    df = df.sort_values("Fecha")
+    if x_range is not None:
+        start, end = pd.Timestamp(x_range[0]), pd.Timestamp(x_range[1])
+        df = df[(df["Fecha"] >= start) & (df["Fecha"] <= end)]
+    colors = {"Historica": color_historical, "Predicha": color_predicted}
+    groups = [(tipo, group) for tipo, group in df.groupby("Tipo", sort=False) if len(group)]
+    downsampled = len(df) > max_points
+    # Short series (the forecast) keep every point within a reserved quarter
+    # of the budget; the long ones share what is left in proportion to length
+    reserved = max_points // 4
+    long_points = sum(len(group) for _, group in groups if len(group) > reserved)
+    remaining = max_points - sum(len(group) for _, group in groups if len(group) <= reserved)
+
+    fig = go.Figure()
+    for tipo, group in groups:
+        budget = len(group) if len(group) <= reserved else max(4, remaining * len(group) // long_points)
+        idx = downsample_indices(group["Fecha"].to_numpy(), group["ACTIVA"].to_numpy(), budget, method)
+        fig.add_trace(
+            go.Scattergl(
+                x=group["Fecha"].to_numpy()[idx],
+                y=group["ACTIVA"].to_numpy()[idx],
+                mode="lines" if downsampled else "lines+markers",
+                name=tipo,
+                line=dict(color=colors.get(tipo)),
+            )
+        )
+
+    lower_col, upper_col = band_columns
+    if lower_col in df.columns and upper_col in df.columns:
+        band = df.dropna(subset=[lower_col, upper_col])
+        if len(band):
+            idx = downsample_indices(band["Fecha"].to_numpy(), band[upper_col].to_numpy(), max(4, max_points // 4), method)
+            band = band.iloc[idx]
+            fig.add_trace(
+                go.Scatter(
+                    x=band["Fecha"], y=band[upper_col],
+                    mode="lines", line=dict(width=0), showlegend=False, hoverinfo="skip",
+                )
+            )
+            fig.add_trace(
+                go.Scatter(
+                    x=band["Fecha"], y=band[lower_col],
+                    mode="lines", line=dict(width=0), fill="tonexty",
+                    fillcolor=_hex_to_rgba(color_predicted, 0.2),
+                    name=f"Intervalo {lower_col}-{upper_col}",
+                )
+            )
+
+    fig.update_layout(
+        title="Serie Temporal de Demanda Energetica",
+        xaxis_title="Fecha",
+        yaxis_title="Demanda Energetica (kWh)",
+    )
+    if x_range is not None:
+        fig.update_xaxes(range=[start, end])
+    _apply_demand_layout(fig)
     return fig
 
 
@@ -63,3 +180,45 @@ def create_scenario_comparison_figure(df_results: pd.DataFrame) -> go.Figure:
     fig.update_layout(xaxis_title="", legend_title="Escenario")
     fig.update_yaxes(type="log", title="Valor (escala logaritmica)")
     return fig
+
+
+def create_sensitivity_heatmap(
+    grid: pd.DataFrame,
+    x: str,
+    y: str,
+    metric: str,
+    x_label: str | None = None,
+    y_label: str | None = None,
+    current: tuple[float, float] | None = None,
+) -> go.Figure:
+    """Create a heatmap of ``metric`` over two parameters of a simulation grid.
+
+    Expects the tidy output of ``simulate_grid`` where only ``x`` and ``y``
+    vary. ``current`` marks the point selected in the sidebar.
+    """
+    table = grid.pivot(index=y, columns=x, values=metric)
+    fig = go.Figure(
+        go.Heatmap(
+            z=table.to_numpy(),
+            x=table.columns,
+            y=table.index,
+            colorscale="Viridis",
+            colorbar=dict(title=""),
+            hovertemplate=f"{x_label or x}: %{{x:.3g}}<br>{y_label or y}: %{{y:.3g}}<br>{metric}: %{{z:,.0f}}<extra></extra>",
+        )
+    )
+    if current is not None:
+        fig.add_trace(
+            go.Scatter(
+                x=[current[0]], y=[current[1]], mode="markers", showlegend=False, hoverinfo="skip",
+                marker=dict(symbol="x", size=12, color="white", line=dict(width=1, color="#333")),
+            )
+        )
+    fig.update_layout(
+        title=metric,
+        xaxis_title=x_label or x,
+        yaxis_title=y_label or y,
+        template="plotly_white",
+        margin=dict(l=30, r=30, t=50, b=30),
+    )
+    return fig
@@ -6,6 +6,7 @@ import pandas as pd
 import pytest
 
 from trillium_watts.prediction.export import export_predictions_csv
+from trillium_watts.prediction.store import ForecastStore
 
 
 def test_export_predictions_csv(tmp_path):
@@ -27,3 +28,51 @@ def test_export_predictions_csv(tmp_path):
     assert set(df.columns) == {"Fecha", "ACTIVA", "Tipo"}
     assert df[df["Tipo"] == "Historica"].shape[0] == 5
     assert df[df["Tipo"] == "Predicha"].shape[0] == 3
+
+
+def test_export_predictions_csv_with_bands(tmp_path):
+    dates_hist = pd.date_range("2024-01-01", periods=3, freq="D")
+    df_hist = pd.DataFrame({"ACTIVA": [100, 200, 300]}, index=dates_hist)
+
+    dates_pred = pd.date_range("2024-01-04", periods=2, freq="D")
+    predictions = pd.Series([350, 400], index=dates_pred)
+    bands = pd.DataFrame({"mean": [350, 400], "P10": [300, 320], "P90": [400, 480]}, index=dates_pred)
+
+    result_path = export_predictions_csv(df_hist, predictions, tmp_path / "bands.csv", bands=bands)
+
+    df = pd.read_csv(result_path)
+    assert set(df.columns) == {"Fecha", "ACTIVA", "Tipo", "P10", "P90"}
+    assert df["P10"].isna().sum() == 3
+    assert df.loc[df["Tipo"] == "Predicha", "P90"].tolist() == [400, 480]
+
+
+def test_forecast_store_appends_runs_and_matches_legacy_csv(tmp_path):
+    dates_hist = pd.date_range("2024-01-01", periods=5, freq="D")
+    df_hist = pd.DataFrame({"ACTIVA": [100.0, 200.0, 300.0, 400.0, 500.0]}, index=dates_hist)
+    predictions = pd.Series([550.0, 600.0], index=pd.date_range("2024-01-06", periods=2, freq="D"))
+    bands = pd.DataFrame({"P10": [500.0, 540.0], "P90": [600.0, 660.0]}, index=predictions.index)
+
+    store = ForecastStore(tmp_path / "store")
+    assert store.append_actuals(df_hist["ACTIVA"]) == 5
+    store.append_forecast(predictions, "v0001", bands=bands, run_at=pd.Timestamp("2024-01-06 08:00"))
+    store.write_csv_view(tmp_path / "view.csv")
+    export_predictions_csv(df_hist, predictions, tmp_path / "legacy.csv", bands=bands)
+    assert (tmp_path / "view.csv").read_text() == (tmp_path / "legacy.csv").read_text()
+
+    # Next day: one new actual and a new run; history is not duplicated
+    df_hist.loc[pd.Timestamp("2024-01-06")] = 560.0
+    next_predictions = pd.Series([610.0, 640.0], index=pd.date_range("2024-01-07", periods=2, freq="D"))
+    assert store.append_actuals(df_hist["ACTIVA"]) == 1
+    store.append_forecast(next_predictions, "v0002", run_at=pd.Timestamp("2024-01-07 08:00"))
+    store.write_csv_view(tmp_path / "view.csv")
+    export_predictions_csv(df_hist, next_predictions, tmp_path / "legacy.csv")
+    assert (tmp_path / "view.csv").read_text() == (tmp_path / "legacy.csv").read_text()
+
+    assert len(store.read_actuals()) == 6
+    runs = store.read_forecasts()
+    assert runs.groupby(["run_date", "model_version"]).size().to_dict() == {
+        ("2024-01-06", "v0001"): 2,
+        ("2024-01-07", "v0002"): 2,
+    }
+    assert store.latest_forecast()["as_of"].iloc[0] == pd.Timestamp("2024-01-06")
+    assert len(store.read_forecasts(model_version="v0001")) == 2
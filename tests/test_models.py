@@ -0,0 +1,177 @@
+"""Tests for model architectures and training helpers."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from trillium_watts.models.architectures import build_ensemble_model, build_model
+from trillium_watts.models.numpy_runtime import NumpyModel, export_numpy_weights
+from trillium_watts.models.persistence import load_model, load_scalers, save_model, save_scalers
+from trillium_watts.models.registry import LiveModel, ModelRegistry
+from trillium_watts.models.scaling import ArrayMinMaxScaler
+from trillium_watts.models.sequences import apply_scalers, create_sequences, fit_scalers
+from trillium_watts.models.training import (
+    benchmark_architectures,
+    evaluate_model,
+    predict_with_spread,
+    retrain_final_ensemble,
+    retrain_final_model,
+)
+from trillium_watts.prediction.direct import predict_direct
+
+
+@pytest.fixture
+def sample_windows():
+    rng = np.random.default_rng(0)
+    X = rng.random((40, 15, 12)).astype("float32")
+    y = rng.random(40).astype("float32")
+    return X, y
+
+
+@pytest.fixture
+def fitted_scalers(sample_windows):
+    X, y = sample_windows
+    return fit_scalers(X, y)
+
+
+@pytest.mark.parametrize("model_type", ["lstm", "gru", "tcn", "attention"])
+def test_build_model_output_shape(model_type, sample_windows):
+    X, _ = sample_windows
+    model = build_model(model_type, units=8, dropout=0.2, learning_rate=0.001, input_shape=(15, 12))
+    assert model(X[:4]).shape == (4, 1)
+
+
+def test_build_model_unknown_type():
+    with pytest.raises(ValueError):
+        build_model("transformer-xl", units=8, dropout=0.2, learning_rate=0.001, input_shape=(15, 12))
+
+
+def test_benchmark_architectures_reports_epoch_time(sample_windows):
+    X, y = sample_windows
+    param_grid = {"units": [4], "dropout": [0.2], "batch_size": [16], "learning_rate": [0.01], "epochs": [2]}
+    rows = benchmark_architectures(["gru", "tcn"], param_grid, X[:30], y[:30], X[30:], y[30:])
+    assert [r["model_type"] for r in rows] == ["gru", "tcn"]
+    for row in rows:
+        assert row["epoch_time"] > 0
+        assert row["predict_time"] > 0
+
+
+def test_ensemble_trains_and_predicts_all_members(sample_windows, fitted_scalers, tmp_path):
+    X, y = sample_windows
+    best = {"params": {"units": 4, "dropout": 0.2, "batch_size": 16, "learning_rate": 0.01, "epochs": 2}}
+    model = retrain_final_ensemble("gru", best, X, y, n_members=3)
+    assert model(X[:5]).shape == (5, 3)
+
+    mean, spread = predict_with_spread(model, X[:5])
+    assert mean.shape == (5,)
+    assert np.all(spread > 0)
+
+    save_model(model, *fitted_scalers, tmp_path)
+    reloaded, _, _ = load_model(tmp_path)
+    np.testing.assert_allclose(reloaded.predict(X[:5], verbose=0), model.predict(X[:5], verbose=0), rtol=1e-5)
+
+
+def test_registry_register_promote_rollback(fitted_scalers, tmp_path):
+    registry = ModelRegistry(tmp_path)
+    assert not registry.exists()
+
+    model_a = build_model("gru", units=4, dropout=0.2, learning_rate=0.001, input_shape=(15, 12))
+    model_b = build_model("gru", units=4, dropout=0.2, learning_rate=0.001, input_shape=(15, 12))
+    v1 = registry.register(model_a, *fitted_scalers, metadata={"window_size": 15})
+    live = LiveModel(registry)
+    assert live.get()[0] == v1
+
+    v2 = registry.register(model_b, *fitted_scalers, metadata={"window_size": 15})
+    assert (v1, v2) == ("v0001", "v0002")
+    assert registry.current_version() == v2
+    assert registry.metadata()["window_size"] == 15
+    assert live.get()[0] == v2
+    assert not list((tmp_path / "versions").glob(".*"))
+
+    assert registry.rollback() == v1
+    assert live.get()[0] == v1
+    registry.promote(v2)
+    assert registry.list_versions() == [v1, v2]
+    with pytest.raises(KeyError):
+        registry.promote("v0099")
+
+
+@pytest.mark.parametrize("model_type", ["gru", "lstm"])
+def test_numpy_runtime_matches_keras(model_type, sample_windows, tmp_path):
+    X, _ = sample_windows
+    model = build_model(model_type, units=8, dropout=0.2, learning_rate=0.001, input_shape=(15, 12))
+    model.set_weights([w + 0.1 for w in model.get_weights()])
+
+    runtime = NumpyModel.load(export_numpy_weights(model, tmp_path / "model.npz"))
+    np.testing.assert_allclose(runtime.predict(X), model.predict(X, verbose=0), atol=1e-5)
+
+
+def test_numpy_runtime_rejects_unsupported_layers(tmp_path):
+    model = build_model("tcn", units=8, dropout=0.2, learning_rate=0.001, input_shape=(15, 12))
+    with pytest.raises(ValueError):
+        export_numpy_weights(model, tmp_path / "model.npz")
+
+
+def test_registry_loads_numpy_runtime(sample_windows, fitted_scalers, tmp_path):
+    X, _ = sample_windows
+    registry = ModelRegistry(tmp_path)
+    model = build_ensemble_model("gru", 2, units=4, dropout=0.2, learning_rate=0.001, input_shape=(15, 12))
+    registry.register(model, *fitted_scalers)
+
+    assert registry.metadata()["numpy_runtime"]
+    runtime, _, _ = registry.load(runtime="auto")
+    assert isinstance(runtime, NumpyModel)
+    np.testing.assert_allclose(runtime.predict(X), model.predict(X, verbose=0), atol=1e-5)
+
+
+def test_array_scaler_matches_sklearn(sample_windows, fitted_scalers, tmp_path):
+    X, _ = sample_windows
+    scaler_X, scaler_y = fitted_scalers
+    rows = X.reshape(-1, X.shape[2])
+
+    portable = ArrayMinMaxScaler.from_dict(ArrayMinMaxScaler.from_scaler(scaler_X).to_dict())
+    np.testing.assert_allclose(portable.transform(rows), scaler_X.transform(rows), atol=1e-6)
+    np.testing.assert_allclose(portable.inverse_transform(rows), scaler_X.inverse_transform(rows), atol=1e-6)
+
+    save_scalers(scaler_X, scaler_y, tmp_path)
+    loaded_X, loaded_y = load_scalers(tmp_path)
+    np.testing.assert_allclose(loaded_X.data_range_, scaler_X.data_range_)
+    np.testing.assert_allclose(loaded_y.data_min_, scaler_y.data_min_)
+
+
+def test_direct_multi_horizon_training_and_prediction(tmp_path):
+    rng = np.random.default_rng(0)
+    data = rng.random((80, 3))
+    X, y = create_sequences(data, window_size=10, target_index=0, horizon=5)
+    assert X.shape == (66, 10, 3)
+    assert y.shape == (66, 5)
+    np.testing.assert_allclose(y[0], data[10:15, 0])
+
+    scaler_X, scaler_y = fit_scalers(X, y)
+    X_scaled, y_scaled = apply_scalers(X, y, scaler_X, scaler_y)
+    assert y_scaled.shape == (66, 5)
+
+    best = {"params": {"units": 4, "dropout": 0.2, "batch_size": 16, "learning_rate": 0.01, "epochs": 1}}
+    model = retrain_final_model("gru", best, X_scaled, y_scaled)
+    assert model(X_scaled[:2]).shape == (2, 5)
+    assert evaluate_model(model, X_scaled, y_scaled, scaler_y)["y_pred"].shape == (66, 5)
+
+    runtime = NumpyModel.load(export_numpy_weights(model, tmp_path / "direct.npz"))
+    history = pd.DataFrame(data, index=pd.date_range("2024-01-01", periods=80, freq="D"))
+    forecast = predict_direct(runtime, X_scaled[-1:], 3, ArrayMinMaxScaler.from_scaler(scaler_y), history)
+    assert list(forecast.index) == list(pd.date_range("2024-03-21", periods=3, freq="D"))
+    with pytest.raises(ValueError):
+        predict_direct(runtime, X_scaled[-1:], 6, ArrayMinMaxScaler.from_scaler(scaler_y), history)
+
+
+def test_direct_mode_ensemble_is_rejected_at_config_load(tmp_path):
+    import yaml
+
+    from trillium_watts.config import _DEFAULT_CONFIG, load_config
+
+    raw = yaml.safe_load(_DEFAULT_CONFIG.read_text())
+    raw["model"].update(forecast_mode="direct", ensemble_members=3)
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.safe_dump(raw))
+    with pytest.raises(ValueError, match="single-step"):
+        load_config(path)
@@ -0,0 +1,252 @@
+"""Tests for the forecasting engine."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from trillium_watts.caching import LRUCache
+from trillium_watts.features.cyclic import compute_cyclic_for_date
+from trillium_watts.features.pipeline import build_calendar_features, build_feature_pipeline
+from trillium_watts.models.numpy_runtime import NumpyModel
+from trillium_watts.models.scaling import ArrayMinMaxScaler
+from trillium_watts.prediction.autoregressive import (
+    build_future_rows,
+    make_forward_fn,
+    predict_future,
+    predict_future_quantiles,
+    prepare_initial_sequence,
+    rollout,
+)
+from trillium_watts.prediction.backtest import BacktestResult, backtest
+from trillium_watts.prediction.direct import predict_direct
+from trillium_watts.prediction.cache import ForecastCache, make_forecast_key
+from trillium_watts.prediction.whatif import predict_whatif
+
+FEATURES = ["ACTIVA", "month_sin", "month_cos", "weekday_sin", "weekday_cos", "T2M"]
+WINDOW = 7
+
+
+def make_gru_runtime(n_features, units=4, seed=0, output_steps=1):
+    rng = np.random.default_rng(seed)
+    spec = [[
+        {"kind": "GRU", "activation": "tanh", "recurrent_activation": "sigmoid", "n_weights": 3},
+        {"kind": "Dropout", "rate": 0.2, "n_weights": 0},
+        {"kind": "Dense", "activation": "linear", "n_weights": 2},
+    ]]
+    weights = {
+        "m0_l0_w0": rng.normal(0, 0.5, (n_features, 3 * units)).astype("float32"),
+        "m0_l0_w1": rng.normal(0, 0.5, (units, 3 * units)).astype("float32"),
+        "m0_l0_w2": rng.normal(0, 0.1, (2, 3 * units)).astype("float32"),
+        "m0_l2_w0": rng.normal(0, 0.5, (units, output_steps)).astype("float32"),
+        "m0_l2_w1": np.full(output_steps, 0.5, dtype="float32"),
+    }
+    return NumpyModel(spec, weights)
+
+
+@pytest.fixture
+def history():
+    rng = np.random.default_rng(1)
+    dates = pd.date_range("2024-01-01", periods=60, freq="D")
+    df = pd.DataFrame(
+        {"ACTIVA": rng.uniform(100_000, 150_000, 60), "T2M": rng.uniform(24, 30, 60)},
+        index=dates,
+    )
+    return build_feature_pipeline(df)
+
+
+@pytest.fixture
+def scaler_X(history):
+    values = history[FEATURES].values
+    return ArrayMinMaxScaler(values.min(axis=0), values.max(axis=0))
+
+
+def test_build_calendar_features_matches_single_date():
+    dates = pd.date_range("2024-12-28", periods=10, freq="D")
+    calendar = build_calendar_features(dates)
+    for i, date in enumerate(dates):
+        for name, value in compute_cyclic_for_date(date).items():
+            assert calendar[name][i] == pytest.approx(value)
+
+
+def test_predict_future_matches_step_by_step_reference(history, scaler_X):
+    model = make_gru_runtime(len(FEATURES))
+    initial = prepare_initial_sequence(history, FEATURES, WINDOW, scaler_X)
+    result = predict_future(model, initial, 5, scaler_X, history, "ACTIVA", FEATURES)
+
+    assert list(result.index) == list(pd.date_range("2024-03-01", periods=5, freq="D"))
+
+    # Naive reference: rebuild the window with a full transform every step
+    window = history[FEATURES].values[-WINDOW:].copy()
+    for date, value in result.items():
+        pred = model.predict(scaler_X.transform(window)[None])[0, 0]
+        expected = pred * scaler_X.data_range_[0] + scaler_X.data_min_[0]
+        assert value == pytest.approx(expected, rel=1e-5)
+        row = window[-1].copy()
+        row[0] = expected
+        for name, val in compute_cyclic_for_date(date).items():
+            if name in FEATURES:
+                row[FEATURES.index(name)] = val
+        window = np.vstack([window[1:], row])
+
+
+def test_rollout_batch_rows_are_independent(history, scaler_X):
+    model = make_gru_runtime(len(FEATURES))
+    initial = prepare_initial_sequence(history, FEATURES, WINDOW, scaler_X)
+    windows = np.concatenate([initial, initial, initial[:, ::-1]])
+    last = history[FEATURES].values[-1]
+    rows = build_future_rows(last, pd.date_range("2024-03-01", periods=4, freq="D"), FEATURES, scaler_X)
+
+    out = rollout(make_forward_fn(model), windows, rows, 0, scaler_X)
+
+    assert out.shape == (3, 4, 1)
+    np.testing.assert_allclose(out[0], out[1])
+    assert not np.allclose(out[0], out[2])
+
+
+def test_backtest_matches_single_origin_forecasts(history, scaler_X):
+    model = make_gru_runtime(len(FEATURES))
+    result = backtest(model, history, FEATURES, "ACTIVA", WINDOW, scaler_X, horizon=5, stride=10, batch_size=2)
+
+    assert result.predictions.shape == (len(result.origin_dates), 5)
+    for k, origin in enumerate(result.origin_dates):
+        past = history.loc[:origin]
+        initial = prepare_initial_sequence(past, FEATURES, WINDOW, scaler_X)
+        expected = predict_future(model, initial, 5, scaler_X, past, "ACTIVA", FEATURES)
+        np.testing.assert_allclose(result.predictions[k], expected.values, rtol=1e-5)
+        np.testing.assert_allclose(result.actuals[k], history["ACTIVA"].loc[expected.index].values)
+
+    metrics = result.metrics()
+    assert list(metrics.columns) == ["mae", "rmse", "mape"]
+    assert list(metrics.index) == [1, 2, 3, 4, 5]
+    assert (metrics["rmse"] >= metrics["mae"]).all()
+
+
+def test_backtest_result_roundtrip(history, scaler_X, tmp_path):
+    result = backtest(make_gru_runtime(len(FEATURES)), history, FEATURES, "ACTIVA", WINDOW, scaler_X, horizon=3)
+    loaded = BacktestResult.load(result.save(tmp_path / "backtest.npz"))
+    np.testing.assert_allclose(loaded.predictions, result.predictions, rtol=1e-6)
+    assert loaded.origin_dates[0] == np.datetime64(result.origin_dates[0], "D")
+
+
+def test_predict_future_quantiles_bands_are_ordered(history, scaler_X):
+    model = make_gru_runtime(len(FEATURES))
+    initial = prepare_initial_sequence(history, FEATURES, WINDOW, scaler_X)
+    residuals = np.random.default_rng(0).normal(0, 1_000, 100)
+
+    bands = predict_future_quantiles(
+        model, initial, 6, scaler_X, history, "ACTIVA", FEATURES,
+        n_samples=300, residuals=residuals, seed=42,
+    )
+
+    assert list(bands.columns) == ["mean", "P10", "P50", "P90"]
+    assert len(bands) == 6
+    assert (bands["P10"] < bands["P50"]).all()
+    assert (bands["P50"] < bands["P90"]).all()
+
+
+def test_forecast_cache_serves_shorter_horizons_as_slices():
+    calls = []
+
+    def compute(n):
+        calls.append(n)
+        return pd.Series(np.arange(n, dtype=float), index=pd.date_range("2025-04-01", periods=n, freq="D"))
+
+    cache = ForecastCache(max_entries=2, min_horizon=30)
+    key = make_forecast_key("v0001", "2025-03-31", {"T2M": 2.0})
+
+    assert len(cache.get_or_compute(key, 7, compute)) == 7
+    assert len(cache.get_or_compute(key, 15, compute)) == 15
+    assert len(cache.get_or_compute(key, 30, compute)) == 30
+    assert len(cache.get_or_compute(key, 45, compute)) == 45
+    assert calls == [30, 45]
+
+    # Different assumptions or data watermark -> different keys, LRU bounded
+    cache.get_or_compute(make_forecast_key("v0001", "2025-03-31", {"T2M": np.zeros(3)}), 7, compute)
+    cache.get_or_compute(make_forecast_key("v0001", "2025-04-01"), 7, compute)
+    assert cache.stats()["size"] == 2
+    cache.get_or_compute(key, 7, compute)
+    assert calls[-1] == 30
+
+
+def test_lru_cache_counts_hits_and_evicts_oldest():
+    cache = LRUCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 2, "max_entries": 2}
+
+
+def test_whatif_batch_matches_individual_forecasts(history, scaler_X):
+    model = make_gru_runtime(len(FEATURES))
+    initial = prepare_initial_sequence(history, FEATURES, WINDOW, scaler_X)
+    kwargs = dict(target_name="ACTIVA", features_list=FEATURES)
+
+    table = predict_whatif(
+        model, initial, 10, scaler_X, history, {"T2M": [0.0, 2.0, -3.0]},
+        scenario_names=["base", "+2", "-3"], mode="delta", **kwargs,
+    )
+    assert table.shape == (3, 10)
+    np.testing.assert_allclose(
+        table.loc["base"].values, predict_future(model, initial, 10, scaler_X, history, **kwargs).values, rtol=1e-5
+    )
+
+    trajectory = np.full((1, 10), history["T2M"].iloc[-1] + 2.0)
+    absolute = predict_whatif(model, initial, 10, scaler_X, history, {"T2M": trajectory}, **kwargs)
+    np.testing.assert_allclose(absolute.iloc[0].values, table.loc["+2"].values, rtol=1e-5)
+    assert not np.allclose(table.loc["+2"].values, table.loc["base"].values)
+
+    with pytest.raises(ValueError):
+        predict_whatif(model, initial, 10, scaler_X, history, {"month_sin": [0.0]}, **kwargs)
+    with pytest.raises(ValueError):
+        predict_whatif(model, initial, 10, scaler_X, history, {"T2M": np.zeros((2, 5))}, **kwargs)
+
+
+def test_forward_fn_cache_does_not_keep_keras_models_alive():
+    import gc
+    import weakref
+
+    from trillium_watts.models.architectures import build_model
+    from trillium_watts.prediction.autoregressive import _FORWARD_CACHE
+
+    model = build_model("gru", 4, 0.2, 0.001, (WINDOW, len(FEATURES)))
+    assert make_forward_fn(model)(np.zeros((2, WINDOW, len(FEATURES)))).shape == (2, 1)
+    ref = weakref.ref(model)
+    del model
+    gc.collect()
+    assert ref() is None
+    assert len(_FORWARD_CACHE) == 0
+
+
+def test_predict_future_quantiles_seed_is_reproducible_with_keras(history, scaler_X):
+    from trillium_watts.models.architectures import build_model
+
+    model = build_model("gru", 4, 0.3, 0.001, (WINDOW, len(FEATURES)))
+    initial = prepare_initial_sequence(history, FEATURES, WINDOW, scaler_X)
+
+    def run(seed):
+        return predict_future_quantiles(model, initial, 4, scaler_X, history, "ACTIVA", FEATURES, n_samples=50, seed=seed)
+
+    first = run(7)
+    pd.testing.assert_frame_equal(run(7), first)
+    assert not np.allclose(run(8)["P90"], first["P90"])
+
+
+def test_direct_models_are_not_rolled_out_step_by_step(history, scaler_X):
+    model = make_gru_runtime(len(FEATURES), output_steps=5)
+    scaler_y = ArrayMinMaxScaler(history[["ACTIVA"]].values.min(axis=0), history[["ACTIVA"]].values.max(axis=0))
+    initial = prepare_initial_sequence(history, FEATURES, WINDOW, scaler_X)
+    with pytest.raises(ValueError, match="predict_direct"):
+        predict_future(model, initial, 5, scaler_X, history, "ACTIVA", FEATURES, scaler_y)
+    with pytest.raises(ValueError, match="predict_direct"):
+        backtest(model, history, FEATURES, "ACTIVA", WINDOW, scaler_X, scaler_y, horizon=5)
+
+    result = backtest(
+        model, history, FEATURES, "ACTIVA", WINDOW, scaler_X, scaler_y, horizon=4, stride=10, forecast_mode="direct"
+    )
+    for k, origin in enumerate(result.origin_dates):
+        past = history.loc[:origin]
+        expected = predict_direct(model, prepare_initial_sequence(past, FEATURES, WINDOW, scaler_X), 4, scaler_y, past)
+        np.testing.assert_allclose(result.predictions[k], expected.values, rtol=1e-5)
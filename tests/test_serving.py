@@ -0,0 +1,154 @@
+"""Tests for the forecast-serving package."""
+
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from trillium_watts.config import load_config
+from trillium_watts.features.pipeline import build_feature_pipeline
+from trillium_watts.models.architectures import build_model
+from trillium_watts.models.registry import LiveModel, ModelRegistry
+from trillium_watts.models.sequences import fit_scalers
+from trillium_watts.serving.batching import MicroBatcher
+from trillium_watts.serving.loadgen import run_load
+from trillium_watts.serving.server import create_server
+from trillium_watts.serving.service import ForecastService
+
+
+@pytest.fixture(scope="module")
+def service(tmp_path_factory):
+    config = load_config()
+    features = config.features.feature_columns
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2024-01-01", periods=120, freq="D")
+    history = build_feature_pipeline(
+        pd.DataFrame(
+            {
+                "ACTIVA": rng.uniform(100_000, 150_000, 120),
+                "REACTIVA": rng.uniform(30_000, 50_000, 120),
+                "ALLSKY_SFC_SW_DWN": rng.uniform(3, 6, 120),
+                "T2M": rng.uniform(24, 30, 120),
+            },
+            index=dates,
+        )
+    )
+    values = history[features].values
+    scaler_X, scaler_y = fit_scalers(values[None], values[:, 0])
+
+    registry = ModelRegistry(tmp_path_factory.mktemp("registry"))
+    window = config.model.window_size
+    registry.register(build_model("gru", 8, 0.2, 0.001, (window, len(features))), scaler_X, scaler_y)
+    return ForecastService(config, LiveModel(registry, runtime="auto"), history, max_wait_ms=20)
+
+
+def test_micro_batcher_coalesces_concurrent_requests():
+    seen = []
+
+    def handler(requests):
+        seen.append(len(requests))
+        time.sleep(0.01)
+        return [r * 2 for r in requests]
+
+    batcher = MicroBatcher(handler, max_batch=8, max_wait_ms=50)
+    futures = [batcher.submit(i) for i in range(8)]
+    assert [f.result(timeout=5) for f in futures] == [i * 2 for i in range(8)]
+    assert len(seen) < 8
+    assert batcher.requests == 8
+
+
+def test_service_forecast_slices_and_caches(service):
+    version, week = service.forecast(7)
+    _, month = service.forecast(30)
+    assert version == "v0001"
+    assert len(week) == 7 and len(month) == 30
+    np.testing.assert_allclose(week.values, month.values[:7])
+    assert service.cache.stats()["size"] == 1
+    # Hits bypass the batcher
+    batches = service.batcher.batches
+    service.forecast(15)
+    assert service.batcher.batches == batches
+    with pytest.raises(ValueError):
+        service.forecast(365)
+
+
+def test_server_endpoints_and_loadgen(service):
+    server = create_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with urllib.request.urlopen(f"{url}/forecast?horizon=15") as response:
+            payload = json.loads(response.read())
+        assert payload["horizon"] == 15
+        assert payload["as_of"] == "2024-04-29"
+
+        request = urllib.request.Request(
+            f"{url}/simulate",
+            data=json.dumps({"horizon": 7, "h_radiation": "climatology"}).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request) as response:
+            payload = json.loads(response.read())
+        assert len(payload["scenarios"]) == 3
+
+        request = urllib.request.Request(
+            f"{url}/whatif",
+            data=json.dumps(
+                {"horizon": 10, "exogenous": {"T2M": [0, 2]}, "mode": "delta", "scenarios": ["base", "+2C"]}
+            ).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request) as response:
+            payload = json.loads(response.read())
+        assert [s["name"] for s in payload["scenarios"]] == ["base", "+2C"]
+        assert len(payload["dates"]) == len(payload["scenarios"][0]["ACTIVA"]) == 10
+
+        request = urllib.request.Request(
+            f"{url}/uncertainty",
+            data=json.dumps({"horizon": 7, "n_samples": 2000, "chunk_size": 500, "seed": 0}).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request) as response:
+            payload = json.loads(response.read())
+        assert len(payload["results"]) == 9  # 3 scenarios x 3 metrics
+        assert all(row["P5"] <= row["P50"] <= row["P95"] for row in payload["results"])
+
+        request = urllib.request.Request(f"{url}/simulate", data=b"[]", headers={"Content-Type": "application/json"})
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(request)
+        assert error.value.code == 400
+
+        stats = run_load(f"{url}/forecast", concurrency=4, n_requests=40, payloads=[{"horizon": 7}])
+        assert stats["requests"] == 40
+        assert stats["p99_ms"] >= stats["p50_ms"] > 0
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_update_history_moves_the_watermark(service):
+    full_history = service.history
+    try:
+        service.update_history(full_history.iloc[:-10])
+        _, older = service.forecast(7)
+        assert service.as_of == full_history.index[-11]
+        assert older.index[0] == full_history.index[-10]
+    finally:
+        service.update_history(full_history)
+    _, latest = service.forecast(7)
+    assert latest.index[0] > older.index[0]
+
+
+def test_batch_spanning_a_history_update_uses_each_request_snapshot(service):
+    full_history = service.history
+    older = full_history.iloc[:-10]
+    results = service._handle_forecasts([{"horizon": 3, "history": older}, {"horizon": 5, "history": full_history}])
+    assert [len(series) for _, series in results] == [3, 5]
+    assert results[0][1].index[0] == full_history.index[-10]
+    assert results[1][1].index[0] > full_history.index[-1]
@@ -1,9 +1,26 @@
 """Tests for simulation modules."""
 
 import numpy as np
+import pandas as pd
 import pytest
 
-from trillium_watts.simulation.solar import calculate_solar_energy
+from trillium_watts.simulation.solar import calculate_solar_energy, irradiance_climatology
+from trillium_watts.simulation.finance import (
+    annuity_factor,
+    internal_rate_of_return,
+    levelized_cost,
+    net_present_value,
+    payback_period,
+)
+from trillium_watts.simulation.grid import GRID_PARAMETERS, SolarUsageCurve, simulate_grid
+from trillium_watts.simulation.dashboard import CHART_COLUMNS, compute_scenario_results, compute_sensitivity_grid
+from trillium_watts.simulation.memo import SimulationCache
+from trillium_watts.simulation.montecarlo import MC_METRICS, simulate_monte_carlo
+from trillium_watts.simulation.profiles import clear_sky_shapes, hourly_profiles, simulate_hourly_scenarios
+from trillium_watts.simulation.projection import project_finances
+from trillium_watts.simulation.sizing import evaluate_sizes, optimize_capacity
+from trillium_watts.simulation.storage import dispatch_storage
+from trillium_watts.simulation.streaming import RunningMoments, StreamingHistogram
 from trillium_watts.simulation.economics import calculate_diesel_savings
 from trillium_watts.simulation.scenarios import simulate_all_scenarios
 
@@ -65,3 +82,289 @@ def test_simulate_all_scenarios():
     assert "Escenario" in result.columns
     assert result.iloc[0]["Escenario"] == "Small"
     assert result.iloc[1]["Escenario"] == "Medium"
+
+
+def test_simulate_grid_matches_scalar_functions():
+    rng = np.random.default_rng(0)
+    demand = rng.uniform(200, 800, 30)
+    capacities, radiation, ratios = [0, 50, 100, 500], [3.5, 4.5, 6.0], [0.7, 0.8]
+    prices = [2000.0, 2553.59]
+    grid = simulate_grid(demand, capacities, radiation, ratios, 3.0, 2.20, prices, chunk_size=7)
+
+    assert len(grid) == 4 * 3 * 2 * 2
+    assert list(grid.columns[: len(GRID_PARAMETERS)]) == list(GRID_PARAMETERS)
+    for row in grid.itertuples(index=False):
+        daily = calculate_solar_energy(row.capacity_kw, row.h_radiation, row.performance_ratio)
+        expected = calculate_diesel_savings(daily, demand, 3.0, 2.20, row.diesel_price_cop)
+        assert row[-3] == pytest.approx(expected["diesel_saved_liters"])
+        assert row[-2] == pytest.approx(expected["economic_savings_cop"])
+        assert row[-1] == pytest.approx(expected["co2_avoided_kg"])
+
+    with pytest.raises(ValueError):
+        simulate_grid(demand, np.ones((2, 2)), 4.5, 0.8, 3.0, 2.2, 2553.59)
+
+
+def test_simulate_all_scenarios_with_daily_irradiance():
+    demand = np.array([500.0, 500.0, 500.0, 500.0])
+    irradiance = np.array([2.0, 4.0, 6.0, 8.0])
+    result = simulate_all_scenarios(
+        scenarios={"Small": 100, "Large": 1000},
+        demand_array=demand,
+        num_days=4,
+        h_radiation=irradiance,
+        performance_ratio=0.5,
+        kwh_per_liter=3.0,
+        co2_per_liter=2.20,
+        diesel_price_cop=2553.59,
+    )
+    # Small: 100, 200, 300, 400 kWh -> all absorbed; Large: capped at 500 each day
+    np.testing.assert_allclose(result["Generacion Solar Total (kWh)"], [1000.0, 10000.0])
+    np.testing.assert_allclose(result["Litros Diesel Ahorrados"], [1000.0 / 3, 2000.0 / 3])
+    np.testing.assert_allclose(result["Capacidad Satisfaccion Demanda (%)"], [50.0, 100.0])
+
+    constant = simulate_all_scenarios(
+        {"Small": 100}, demand, 4, np.full(4, 4.5), 0.8, 3.0, 2.20, 2553.59
+    )
+    scalar = simulate_all_scenarios({"Small": 100}, demand, 4, 4.5, 0.8, 3.0, 2.20, 2553.59)
+    pd.testing.assert_frame_equal(constant, scalar)
+
+
+def test_irradiance_climatology():
+    dates = pd.date_range("2021-01-01", "2022-12-31", freq="D")
+    irradiance = pd.Series(np.where(dates.year == 2021, 4.0, 6.0), index=dates)
+    targets = pd.DatetimeIndex(["2024-02-29", "2025-07-01"])
+    np.testing.assert_allclose(irradiance_climatology(irradiance, targets), [5.0, 5.0])
+
+
+def _dispatch_reference(generation, demand, capacity, power, efficiency):
+    eta, soc, discharged = np.sqrt(efficiency), 0.0, 0.0
+    for gen, dem in zip(generation, demand):
+        charge = min(max(gen - dem, 0.0), power, (capacity - soc) / eta)
+        soc += charge * eta
+        out = min(max(dem - gen, 0.0), power, soc * eta)
+        soc -= out / eta
+        discharged += out
+    return discharged, soc
+
+
+def test_dispatch_storage_matches_scalar_recurrence():
+    rng = np.random.default_rng(0)
+    demand = rng.uniform(300, 700, 48)
+    generation = np.outer([200.0, 600.0, 900.0], rng.uniform(0.2, 1.5, 48))
+    capacities = np.array([0.0, 500.0, 2000.0])
+
+    result = dispatch_storage(
+        generation, demand, capacities, power_kw=10.0, round_trip_efficiency=0.85, keep_soc=True
+    )
+    for i in range(3):
+        discharged, soc = _dispatch_reference(generation[i], demand, capacities[i], 240.0, 0.85)
+        assert result.discharged_kwh[i] == pytest.approx(discharged)
+        assert result.final_soc_kwh[i] == pytest.approx(soc)
+
+    eta = np.sqrt(0.85)
+    np.testing.assert_allclose(result.charged_kwh * eta - result.discharged_kwh / eta, result.final_soc_kwh)
+    assert result.discharged_kwh[0] == 0.0 and result.equivalent_full_cycles[0] == 0.0
+    assert np.all(result.soc_kwh <= capacities[:, None] + 1e-3)
+    np.testing.assert_allclose(result.diesel_displaced_liters(3.0), result.discharged_kwh / 3.0)
+
+
+def test_simulate_all_scenarios_with_battery_displaces_more_diesel():
+    demand = np.full(10, 1000.0)
+    common = dict(
+        scenarios={"Grande": 5000}, demand_array=demand, num_days=10, h_radiation=np.tile([0.1, 0.8], 5),
+        performance_ratio=0.8, kwh_per_liter=3.0, co2_per_liter=2.2, diesel_price_cop=2553.59,
+    )
+    without = simulate_all_scenarios(**common)
+    with_battery = simulate_all_scenarios(**common, battery_kwh=2000.0, round_trip_efficiency=0.81)
+    extra = with_battery["Diesel Adicional por Bateria (L)"].iloc[0]
+    assert extra > 0
+    assert with_battery["Litros Diesel Ahorrados"].iloc[0] == pytest.approx(without["Litros Diesel Ahorrados"].iloc[0] + extra)
+    assert with_battery["Ciclos Equivalentes Bateria"].iloc[0] > 0
+
+
+def test_streaming_estimators_match_numpy():
+    rng = np.random.default_rng(0)
+    data = np.concatenate([rng.normal(0, 1, 5000), rng.lognormal(3, 1, 50000), -rng.exponential(50, 20000)])
+    rng.shuffle(data)
+    histogram, moments = StreamingHistogram(4096), RunningMoments(1)
+    for chunk in np.array_split(data, 13):
+        histogram.update(chunk)
+        moments.update(chunk[None])
+
+    np.testing.assert_allclose(
+        histogram.quantile([0.05, 0.5, 0.95]), np.quantile(data, [0.05, 0.5, 0.95]), atol=2 * histogram.width
+    )
+    assert moments.mean[0] == pytest.approx(data.mean())
+    assert moments.std[0] == pytest.approx(data.std(ddof=1))
+
+
+def test_monte_carlo_without_uncertainty_matches_deterministic():
+    demand = np.random.default_rng(1).uniform(300, 700, 30)
+    scenarios = {"Small": 100, "Large": 1000}
+    deterministic = simulate_all_scenarios(scenarios, demand, 30, 4.5, 0.8, 3.0, 2.2, 2553.59)
+    result = simulate_monte_carlo(
+        scenarios, demand, 4.5, 0.8, 3.0, 2.2, 2553.59, n_samples=1000, chunk_size=300,
+        h_radiation_sd=0.0, performance_ratio_sd=0.0, diesel_price_cv=0.0, demand_cv=0.0,
+    )
+    assert list(result.columns) == ["mean", "std", "P5", "P50", "P95"]
+    for name, row in deterministic.set_index("Escenario").iterrows():
+        for metric in MC_METRICS:
+            np.testing.assert_allclose(result.loc[(name, metric), ["mean", "P5", "P95"]], row[metric], rtol=1e-9)
+
+    uncertain = simulate_monte_carlo(scenarios, demand, 4.5, 0.8, 3.0, 2.2, 2553.59, n_samples=20000, seed=0)
+    spread = uncertain.xs("Ahorro Economico (COP)", level="Metrica")
+    assert np.all(spread["P5"] < spread["P50"]) and np.all(spread["P50"] < spread["P95"])
+
+
+def test_finance_helpers():
+    assert annuity_factor(0.0, 10) == pytest.approx(10.0)
+    assert annuity_factor(0.1, 2) == pytest.approx(1 / 1.1 + 1 / 1.21)
+    assert net_present_value(100.0, 60.0, 0.1, 2) == pytest.approx(60 / 1.1 + 60 / 1.21 - 100)
+    assert levelized_cost(100.0, 0.0, 0.0, 0.1, 10) == np.inf
+
+
+def test_optimize_capacity_matches_brute_force():
+    demand = np.random.default_rng(0).uniform(5000, 7500, 365)
+    args = (demand, 4.5, 0.8, 3.0, 2553.59, 4.0e6)
+    result = optimize_capacity(*args, max_capacity_kw=10_000, grid_points=11, iterations=6)
+
+    capacities = np.linspace(0, 10_000, 20_001)
+    brute = evaluate_sizes(capacities, 0.0, *args)
+    assert result.npv_cop == pytest.approx(brute["npv_cop"].max(), rel=1e-4)
+    assert abs(result.capacity_kw - capacities[brute["npv_cop"].argmax()]) < 20
+
+    with_battery = optimize_capacity(
+        *args, max_battery_kwh=5000, battery_capex_cop_per_kwh=1.0, grid_points=5, iterations=3
+    )
+    assert with_battery.npv_cop >= result.npv_cop
+    assert with_battery.battery_kwh > 0
+    with pytest.raises(ValueError):
+        optimize_capacity(*args, objective="irr")
+
+
+def test_irr_and_payback():
+    flows = np.array([[-100.0, 60.0, 60.0], [-100.0, 0.0, 0.0]])
+    irr = internal_rate_of_return(flows)
+    assert net_present_value(100.0, 60.0, irr[0], 2) == pytest.approx(0.0, abs=1e-6)
+    assert np.isnan(irr[1])
+    np.testing.assert_allclose(payback_period(flows), [1 + 40 / 60, np.nan])
+
+
+def test_project_finances_matches_per_day_savings():
+    rng = np.random.default_rng(0)
+    demand, irradiance = rng.uniform(5000, 7500, 365), rng.uniform(0, 6, 365)
+    curve = SolarUsageCurve(irradiance, demand)
+    np.testing.assert_allclose(curve([0.0, 500.0, 5000.0]), [np.minimum(r * irradiance, demand).sum() for r in (0, 500, 5000)])
+
+    scenarios = {"Small": 100, "Large": 5000}
+    result = project_finances(
+        scenarios, demand, irradiance, 0.8, 3.0, 2500.0, 4e6,
+        lifetime_years=20, degradation=0.01, diesel_escalation=0.03, demand_growth=0.02,
+    )
+    assert result.cash_flows.shape == (2, 21)
+    for i, capacity in enumerate(scenarios.values()):
+        for year in (0, 9, 19):
+            generation = calculate_solar_energy(capacity, irradiance, 0.8) * 0.99**year
+            expected = calculate_diesel_savings(generation, demand * 1.02**year, 3.0, 2.2, 2500.0)
+            assert result.annual_diesel_liters[i, year] == pytest.approx(expected["diesel_saved_liters"])
+    summary = result.summary()
+    assert list(summary["Escenario"]) == ["Small", "Large"]
+    np.testing.assert_allclose(summary["VPN (COP)"], result.npv())
+
+    sweep = project_finances(
+        scenarios, demand, irradiance, 0.8, 3.0, np.linspace(2000, 3000, 50), 4e6,
+        discount_rate=np.linspace(0.05, 0.15, 50), lifetime_years=20,
+    )
+    assert sweep.npv().shape == (50, 2)
+    np.testing.assert_allclose(sweep.npv()[25], project_finances(
+        scenarios, demand, irradiance, 0.8, 3.0, np.linspace(2000, 3000, 50)[25], 4e6,
+        discount_rate=np.linspace(0.05, 0.15, 50)[25], lifetime_years=20,
+    ).npv())
+
+
+def test_hourly_profiles_preserve_daily_totals():
+    dates = pd.date_range("2024-01-01", periods=14, freq="D")
+    demand = pd.Series(np.linspace(500, 800, 14), index=dates)
+    irradiance = np.linspace(3, 6, 14)
+    demand_hourly, irradiance_hourly = hourly_profiles(demand, irradiance)
+
+    assert demand_hourly.shape == irradiance_hourly.shape == (14, 24)
+    assert demand_hourly.dtype == irradiance_hourly.dtype == np.float32
+    np.testing.assert_allclose(demand_hourly.sum(axis=1), demand, rtol=1e-5)
+    np.testing.assert_allclose(irradiance_hourly.sum(axis=1), irradiance, rtol=1e-5)
+    assert np.all(clear_sky_shapes(dates)[:, [0, 3, 20, 23]] == 0)
+
+
+def test_hourly_simulation_does_not_overstate_daily_satisfaction():
+    dates = pd.date_range("2024-01-01", periods=30, freq="D")
+    demand = pd.Series(np.full(30, 1000.0), index=dates)
+    demand_hourly, irradiance_hourly = hourly_profiles(demand, 4.5)
+    scenarios = {"Small": 20, "Large": 400}
+    args = (0.8, 3.0, 2.2, 2553.59)
+
+    daily = simulate_all_scenarios(scenarios, demand.values, 30, 4.5, *args)
+    hourly = simulate_hourly_scenarios(scenarios, demand_hourly, irradiance_hourly, *args)
+    np.testing.assert_allclose(hourly["Generacion Solar Total (kWh)"], daily["Generacion Solar Total (kWh)"], rtol=1e-5)
+    # Small never exceeds hourly demand; Large covers midday only
+    assert hourly["Litros Diesel Ahorrados"].iloc[0] == pytest.approx(daily["Litros Diesel Ahorrados"].iloc[0], rel=1e-5)
+    assert hourly["Capacidad Satisfaccion Demanda (%)"].iloc[1] < daily["Capacidad Satisfaccion Demanda (%)"].iloc[1]
+
+    generation = np.outer([20 * 0.8, 400 * 0.8], irradiance_hourly.ravel())
+    expected = np.minimum(generation, demand_hourly.ravel()).sum(axis=1) / 3.0
+    np.testing.assert_allclose(hourly["Litros Diesel Ahorrados"], expected, rtol=1e-5)
+
+    with_battery = simulate_hourly_scenarios(scenarios, demand_hourly, irradiance_hourly, *args, battery_kwh=1000.0)
+    assert with_battery["Litros Diesel Ahorrados"].iloc[1] > hourly["Litros Diesel Ahorrados"].iloc[1]
+
+
+def test_simulation_cache_hits_normalized_parameters():
+    cache = SimulationCache(max_entries=2)
+    demand = np.array([300.0, 350.0, 400.0])
+    params = dict(
+        scenarios={"A": 50, "B": 100}, demand_array=demand, num_days=3, h_radiation=4.5,
+        performance_ratio=0.8, kwh_per_liter=3.0, co2_per_liter=2.2, diesel_price_cop=2553.59,
+    )
+
+    first = cache.simulate_all_scenarios(**params)
+    pd.testing.assert_frame_equal(first, simulate_all_scenarios(**params))
+    first["Escenario"] = "modified"  # callers get a copy
+    again = cache.simulate_all_scenarios(**{**params, "h_radiation": 4.5 + 1e-10, "demand_array": demand.copy()})
+    assert list(again["Escenario"]) == ["A", "B"]
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    cache.simulate_all_scenarios(**{**params, "demand_array": demand[:2], "num_days": 2})
+    cache.simulate_all_scenarios(**{**params, "scenarios": {"B": 100, "A": 50}})
+    assert cache.stats() == {"hits": 1, "misses": 3, "size": 2, "max_entries": 2}
+    cache.simulate_all_scenarios(**params)  # evicted
+    assert cache.stats()["misses"] == 4
+
+
+def test_scenario_results_feed_metrics_chart_and_table():
+    demand = np.array([300.0, 350.0, 400.0])
+    args = (4.5, 0.8, 3.0, 2.2, 2553.59)
+    cache = SimulationCache()
+    results = compute_scenario_results({"A": 50, "B": 200}, demand, *args, cache=cache)
+
+    pd.testing.assert_frame_equal(results.summary, simulate_all_scenarios({"A": 50, "B": 200}, demand, 3, *args))
+    assert list(results.chart_data.columns) == CHART_COLUMNS
+    # B generates 720 kWh/day, more than any day's demand: savings are capped
+    metrics = results.metrics("B")
+    assert metrics["Generacion Solar Total (kWh)"] == pytest.approx(2160.0)
+    assert metrics["Litros Diesel Ahorrados"] == pytest.approx(1050.0 / 3.0)
+    assert compute_scenario_results({"A": 50, "B": 200}, demand, *args, cache=cache) is results
+    with pytest.raises(ValueError):
+        results.metrics("C")
+
+
+def test_sensitivity_grid_matches_scenario_simulation():
+    demand = np.array([300.0, 350.0, 400.0])
+    h_values, pr_values = np.linspace(1.0, 8.0, 8), np.linspace(0.6, 0.95, 8)
+    fixed = dict(capacity_kw=100, kwh_per_liter=3.0, co2_per_liter=2.2, diesel_price_cop=2553.59)
+    grid = compute_sensitivity_grid(demand, h_values, pr_values, cache=SimulationCache(), **fixed)
+
+    assert len(grid) == 64
+    point = grid[(grid["h_radiation"] == h_values[3]) & (grid["performance_ratio"] == pr_values[5])].iloc[0]
+    expected = simulate_all_scenarios({"A": 100}, demand, 3, h_values[3], pr_values[5], 3.0, 2.2, 2553.59).iloc[0]
+    assert point["Ahorro Economico (COP)"] == pytest.approx(expected["Ahorro Economico (COP)"])
+    with pytest.raises(ValueError):
+        compute_sensitivity_grid(demand, h_values, pr_values, kwh_per_liter=3.0)
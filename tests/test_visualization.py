@@ -0,0 +1,68 @@
+"""Tests for visualization helpers."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from trillium_watts.visualization.downsampling import lttb_indices, minmax_indices
+from trillium_watts.simulation.grid import simulate_grid
+from trillium_watts.visualization.plots_plotly import create_demand_time_series_figure, create_sensitivity_heatmap
+
+
+def test_downsampling_keeps_endpoints_and_extremes():
+    rng = np.random.default_rng(0)
+    y = rng.normal(size=10_000)
+    y[4321], y[777] = 50.0, -50.0
+    x = np.arange(len(y))
+
+    for idx in (lttb_indices(x, y, 500), minmax_indices(y, 500)):
+        assert len(idx) <= 500
+        assert idx[0] == 0 and idx[-1] == len(y) - 1
+        assert np.all(np.diff(idx) > 0)
+        assert 4321 in idx and 777 in idx
+    # Short series are returned unchanged
+    np.testing.assert_array_equal(lttb_indices(x[:100], y[:100], 500), np.arange(100))
+    with pytest.raises(ValueError):
+        lttb_indices(x, y, 2)
+
+
+def test_downsampled_demand_figure_is_bounded():
+    dates = pd.date_range("2000-01-01", periods=20_000, freq="D")
+    df = pd.DataFrame({
+        "Fecha": dates,
+        "ACTIVA": np.sin(np.arange(len(dates)) / 30.0) * 100 + 1000,
+        "Tipo": ["Historica"] * (len(dates) - 30) + ["Predicha"] * 30,
+    })
+
+    fig = create_demand_time_series_figure(df, max_points=1000)
+    assert {trace.type for trace in fig.data} == {"scattergl"}
+    assert sum(len(trace.x) for trace in fig.data) <= 1000
+    predicted = next(trace for trace in fig.data if trace.name == "Predicha")
+    assert len(predicted.x) == 30
+
+    # Zoomed to fewer days than the budget: full resolution
+    zoomed = create_demand_time_series_figure(df, max_points=1000, x_range=("2054-01-01", "2054-03-01"))
+    assert sum(len(trace.x) for trace in zoomed.data) == 60
+
+
+def test_sensitivity_heatmap_pivots_grid():
+    grid = simulate_grid(np.full(30, 500.0), 100, np.linspace(1, 8, 5), np.linspace(0.6, 0.95, 4), 3.0, 2.2, 2553.59)
+    fig = create_sensitivity_heatmap(grid, "h_radiation", "performance_ratio", "Reduccion CO2 (kg)", current=(4.5, 0.8))
+    heatmap = fig.data[0]
+    assert np.shape(heatmap.z) == (4, 5)
+    assert heatmap.z[0][0] < heatmap.z[-1][-1]
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+def test_downsampled_demand_figure_zoomed_onto_one_or_two_points(method):
+    dates = pd.date_range("2024-01-01", periods=3_000, freq="D")
+    df = pd.DataFrame({
+        "Fecha": dates,
+        "ACTIVA": np.arange(len(dates), dtype=float),
+        "Tipo": ["Historica"] * (len(dates) - 30) + ["Predicha"] * 30,
+    })
+    # Last historical day plus the first two forecast days
+    fig = create_demand_time_series_figure(
+        df, max_points=1000, x_range=(dates[-31], dates[-29]), method=method
+    )
+    assert sorted(len(trace.x) for trace in fig.data) == [1, 2]